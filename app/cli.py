@@ -4,6 +4,7 @@ from __future__ import annotations
 import json
 from src.analyzer import analyze_checkin
 from src.engine import assess_risk
+from src.result_io import result_record
 
 
 def main() -> None:
@@ -15,16 +16,7 @@ def main() -> None:
     alert = assess_risk(analysis, recent_scores=[])
 
     print("\n--- result ---")
-    print(json.dumps({
-        "emotion": analysis.emotion,
-        "sentiment_score": analysis.sentiment_score,
-        "flags": analysis.flags,
-        "features": analysis.features,
-        "risk_level": alert.risk_level,
-        "engine_flags": [f for f in alert.flags if f not in analysis.flags],
-        "explanation": alert.explanation,
-        "suggested_action": alert.suggested_action,
-    }, ensure_ascii=False, indent=2))
+    print(json.dumps(result_record(analysis, alert), ensure_ascii=False, indent=2))
 
 
 if __name__ == "__main__":
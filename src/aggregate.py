@@ -0,0 +1,154 @@
+# src/aggregate.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, Tuple, Union
+
+from .analyzer import AnalysisResult
+from .engine import AlertResult, RISK_LEVELS
+
+
+LEVELS = ("school", "grade", "classroom")
+WINDOWS = ("day", "week")
+
+# (level, group, window, period_start)
+#   group: ("school",), ("school", "grade") or ("school", "grade", "classroom")
+#   period_start: ISO date of the day, or of the Monday of the ISO week
+RollupKey = Tuple[str, Tuple[str, ...], str, str]
+
+
+@dataclass
+class GroupStats:
+    n: int = 0
+    risk_counts: Dict[str, int] = field(default_factory=lambda: {r: 0 for r in RISK_LEVELS})
+    sentiment_sum: float = 0.0
+    flag_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_sentiment(self) -> float:
+        return self.sentiment_sum / self.n if self.n else 0.0
+
+    def add(self, sentiment_score: float, risk_level: str, flags) -> None:
+        self.n += 1
+        self.risk_counts[risk_level] = self.risk_counts.get(risk_level, 0) + 1
+        self.sentiment_sum += sentiment_score
+        for f in flags:
+            self.flag_counts[f] = self.flag_counts.get(f, 0) + 1
+
+    def merge(self, other: "GroupStats") -> None:
+        self.n += other.n
+        for k, v in other.risk_counts.items():
+            self.risk_counts[k] = self.risk_counts.get(k, 0) + v
+        self.sentiment_sum += other.sentiment_sum
+        for k, v in other.flag_counts.items():
+            self.flag_counts[k] = self.flag_counts.get(k, 0) + v
+
+    def copy(self) -> "GroupStats":
+        return GroupStats(self.n, dict(self.risk_counts), self.sentiment_sum, dict(self.flag_counts))
+
+    def as_dict(self) -> Dict:
+        return {
+            "n": self.n,
+            "risk_counts": dict(self.risk_counts),
+            "mean_sentiment": self.mean_sentiment,
+            "flag_counts": dict(sorted(self.flag_counts.items())),
+        }
+
+
+def period_start(when: Union[date, datetime], window: str) -> str:
+    d = when.date() if isinstance(when, datetime) else when
+    if window == "day":
+        return d.isoformat()
+    if window == "week":
+        return (d - timedelta(days=d.weekday())).isoformat()
+    raise ValueError(f"Unknown window: {window}")
+
+
+def group_key(level: str, school: str, grade: str = "", classroom: str = "") -> Tuple[str, ...]:
+    if level == "school":
+        return (school,)
+    if level == "grade":
+        return (school, grade)
+    if level == "classroom":
+        return (school, grade, classroom)
+    raise ValueError(f"Unknown level: {level}")
+
+
+class RollupStore:
+    """
+    Incrementally maintained per-school / per-grade / per-classroom rollups.
+
+    Every check-in updates one GroupStats per (level, window), so a dashboard
+    query is a single dict lookup regardless of how many entries were seen.
+    Stores built by parallel workers can be combined with merge().
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[RollupKey, GroupStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def add(
+        self,
+        analysis: AnalysisResult,
+        alert: AlertResult,
+        when: Union[date, datetime],
+        school: str,
+        grade: str = "",
+        classroom: str = "",
+    ) -> None:
+        periods = [(w, period_start(when, w)) for w in WINDOWS]
+        for level in LEVELS:
+            group = group_key(level, school, grade, classroom)
+            for window, start in periods:
+                key = (level, group, window, start)
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = GroupStats()
+                stats.add(analysis.sentiment_score, alert.risk_level, alert.flags)
+
+    def merge(self, other: "RollupStore") -> None:
+        for key, stats in other._stats.items():
+            mine = self._stats.get(key)
+            if mine is None:
+                mine = self._stats[key] = GroupStats()
+            mine.merge(stats)
+
+    def query(
+        self,
+        level: str,
+        when: Union[date, datetime],
+        window: str,
+        school: str,
+        grade: str = "",
+        classroom: str = "",
+    ) -> GroupStats:
+        """
+        Rollup for one group and period (a copy; an empty GroupStats if
+        nothing was seen), so callers cannot modify the store through it.
+        """
+        key = (level, group_key(level, school, grade, classroom), window, period_start(when, window))
+        stats = self._stats.get(key)
+        return stats.copy() if stats is not None else GroupStats()
+
+    def items(self) -> Iterator[Tuple[RollupKey, GroupStats]]:
+        """(key, copy of GroupStats) for every rollup."""
+        return ((key, stats.copy()) for key, stats in list(self._stats.items()))
+
+    def drop_before(self, when: Union[date, datetime]) -> int:
+        """
+        Expire periods that ended before `when`: days before it, and weeks
+        whose last day is before it. Returns the number of rollups removed.
+        """
+        cutoff = when.date() if isinstance(when, datetime) else when
+        day_cutoff = cutoff.isoformat()
+        week_cutoff = (cutoff - timedelta(days=6)).isoformat()   # week start + 6 < cutoff
+        stale = [
+            key for key in self._stats
+            if key[3] < (day_cutoff if key[2] == "day" else week_cutoff)
+        ]
+        for key in stale:
+            del self._stats[key]
+        return len(stale)
@@ -2,19 +2,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple
 import re
 
-from .lexicon import (
-    EMOTION_BASE,
-    POS_WORDS,
-    NEG_WORDS,
-    INTENSIFIERS,
-    NEGATIONS,
-    CONCERNING_PHRASES,
-)
+from .lexicon import Lexicon, current_lexicon
 
 _WORD_RE = re.compile(r"[a-zA-Z']+")
+_SCAN_RE = re.compile(r"[a-zA-Z']+|[.,;:!?]+")
+_BOUNDARY_CHARS = frozenset(".,;:!?")
+
+# Bump whenever a change to the scoring code alters results for the same
+# lexicon and config (part of cache keys and evaluation checkpoints).
+ANALYZER_VERSION = 2
 
 
 @dataclass
@@ -23,82 +22,385 @@ class AnalysisResult:
     sentiment_score: float   # -1.0 ~ 1.0
     flags: List[str]
     features: Dict[str, int]
+    lexicon_version: str = ""  # Lexicon.version() of the vocabulary used
 
 
 def _clamp(x: float, lo: float = -1.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
 
-def _tokenize(text: str) -> List[str]:
+def tokenize(text: str) -> List[str]:
     return [m.group(0).lower() for m in _WORD_RE.finditer(text)]
 
 
-def analyze_checkin(emotion: str, text: str) -> AnalysisResult:
+def scan(text: str) -> List[str]:
+    """tokenize() plus punctuation runs (",", "." ...) marking clause boundaries."""
+    return [m.group(0).lower() for m in _SCAN_RE.finditer(text)]
+
+
+@dataclass(frozen=True)
+class ScorerConfig:
+    negation_window: int = 2            # tokens after a negation that get flipped
+    intensifier_weight: float = 1.5     # multiplier for the cue right after an intensifier
+    diminisher_weight: float = 0.5      # multiplier for the cue right after a diminisher
+    reset_at_punctuation: bool = True   # negation / modifier scope ends at , . ; : ! ?
+
+    def version(self) -> str:
+        return (
+            f"w{self.negation_window}:i{self.intensifier_weight!r}:"
+            f"d{self.diminisher_weight!r}:p{int(self.reset_at_punctuation)}"
+        )
+
+
+DEFAULT_SCORER = ScorerConfig()
+
+
+# Bit flags for the decision-only fast path (see engine.decide_checkin).
+# Bit positions are shared with the engine's own flags, so analyzer and
+# engine flags fit in one int.
+FLAG_CONCERNING_LANGUAGE = 1 << 0
+FLAG_UNKNOWN_EMOTION_NEGATIVE = 1 << 1
+FLAG_STRONG_NEGATIVE_SIGNAL = 1 << 2
+
+ANALYZER_FLAG_NAMES: Dict[int, str] = {
+    FLAG_CONCERNING_LANGUAGE: "concerning_language",
+    FLAG_UNKNOWN_EMOTION_NEGATIVE: "unknown_emotion_with_negative_text",
+    FLAG_STRONG_NEGATIVE_SIGNAL: "strong_negative_signal",
+}
+ANALYZER_FLAG_BITS: Dict[str, int] = {v: k for k, v in ANALYZER_FLAG_NAMES.items()}
+
+FEATURE_NAMES = (
+    "pos_hits",
+    "neg_hits",
+    "intensifier_hits",
+    "diminisher_hits",
+    "negation_hits",
+    "concerning_phrase_hits",
+)
+
+
+def _score(
+    emo: str,
+    tokens: List[str],
+    lowered: str,
+    lex: Lexicon,
+    cfg: ScorerConfig,
+) -> Tuple[float, int, Tuple[int, int, int, int, int, int]]:
     """
-    Lightweight, explainable scoring:
-    - base score from emotion wheel
-    - word cues +/- adjustments
-    - intensifier + negation handling (simple heuristic)
-    - concerning phrase flags
+    Core scoring loop shared by analyze_checkin and score_tokens.
+
+    `tokens` is scan(text) and `lowered` is text.strip().lower(); both can be
+    computed once and scored against several lexicons / configs.
+
+    Single pass over the tokens carrying a small state: how many tokens the
+    last negation still covers, and the multiplier left by a preceding
+    intensifier / diminisher. Cost is O(tokens) for any negation window.
+
+    Returns (unclamped score, analyzer flag bits, hit counts) where hit counts
+    follow FEATURE_NAMES.
     """
-    emo = (emotion or "").strip().lower()
-    base = EMOTION_BASE.get(emo, 0.0)
-
-    tokens = _tokenize(text or "")
-    flags: List[str] = []
-    features = {
-        "pos_hits": 0,
-        "neg_hits": 0,
-        "intensifier_hits": 0,
-        "negation_hits": 0,
-        "concerning_phrase_hits": 0,
-    }
-
-    # Phrase flags (cheap but useful)
-    lowered = (text or "").strip().lower()
-    for phrase in CONCERNING_PHRASES:
-        if phrase in lowered:
-            features["concerning_phrase_hits"] += 1
-            flags.append("concerning_language")
+    emotion_base = lex.emotion_base
+    pos_words = lex.pos_words
+    neg_words = lex.neg_words
+    intensifiers = lex.intensifiers
+    diminishers = lex.diminishers
+    negations = lex.negations
+    window = cfg.negation_window
+    reset = cfg.reset_at_punctuation
 
-    score = base
+    base = emotion_base.get(emo, 0.0)
 
-    # Simple cue scoring with local context
-    for i, w in enumerate(tokens):
-        prev = tokens[i - 1] if i - 1 >= 0 else ""
-        prev2 = tokens[i - 2] if i - 2 >= 0 else ""
+    bits = 0
+    pos_hits = neg_hits = intensifier_hits = diminisher_hits = negation_hits = phrase_hits = 0
 
-        is_negated = prev in NEGATIONS or prev2 in NEGATIONS
-        if prev in INTENSIFIERS:
-            features["intensifier_hits"] += 1
-            boost = 1.5
-        else:
-            boost = 1.0
+    # Phrase flags (cheap but useful). Empty `lowered` skips them: the
+    # segmented mode matches phrases on tokens itself.
+    if lowered:
+        for phrase in lex.concerning_phrases:
+            if phrase in lowered:
+                phrase_hits += 1
+                bits |= FLAG_CONCERNING_LANGUAGE
 
-        if prev in NEGATIONS or prev2 in NEGATIONS:
-            features["negation_hits"] += 1
+    score = base
 
-        if w in POS_WORDS:
-            features["pos_hits"] += 1
+    neg_scope = 0       # remaining tokens covered by the last negation
+    boost = 1.0         # multiplier set by the previous token
+    modifier = 0        # previous token was an intensifier (1) / diminisher (2)
+    for w in tokens:
+        if w[0] in _BOUNDARY_CHARS:
+            if reset:
+                neg_scope = 0
+                boost = 1.0
+                modifier = 0
+            continue
+
+        is_negated = neg_scope > 0
+        if is_negated:
+            negation_hits += 1
+        # Like negation_hits, modifier hits count the tokens a modifier
+        # applies to (the token after it), not the modifier words.
+        if modifier == 1:
+            intensifier_hits += 1
+        elif modifier == 2:
+            diminisher_hits += 1
+
+        if w in pos_words:
+            pos_hits += 1
             delta = 0.12 * boost
             score += (-delta if is_negated else delta)
 
-        if w in NEG_WORDS:
-            features["neg_hits"] += 1
+        if w in neg_words:
+            neg_hits += 1
             delta = 0.14 * boost
             score += (delta if is_negated else -delta)
 
+        # State for the next token
+        if w in negations:
+            neg_scope = window
+        elif neg_scope:
+            neg_scope -= 1
+
+        if w in intensifiers:
+            boost = cfg.intensifier_weight
+            modifier = 1
+        elif w in diminishers:
+            boost = cfg.diminisher_weight
+            modifier = 2
+        else:
+            boost = 1.0
+            modifier = 0
+
     # Mild penalty if emotion itself is unknown but text is very negative
-    if emo not in EMOTION_BASE and features["neg_hits"] >= 3:
-        flags.append("unknown_emotion_with_negative_text")
+    if emo not in emotion_base and neg_hits >= 3:
+        bits |= FLAG_UNKNOWN_EMOTION_NEGATIVE
 
     # Flag persistent negativity in single entry (very rough heuristic)
-    if score < -0.6 and features["neg_hits"] >= 2:
-        flags.append("strong_negative_signal")
+    if score < -0.6 and neg_hits >= 2:
+        bits |= FLAG_STRONG_NEGATIVE_SIGNAL
+
+    return score, bits, (pos_hits, neg_hits, intensifier_hits, diminisher_hits, negation_hits, phrase_hits)
+
+
+def analyze_checkin(
+    emotion: str,
+    text: str,
+    lexicon: Optional[Lexicon] = None,
+    config: Optional[ScorerConfig] = None,
+) -> AnalysisResult:
+    """
+    Lightweight, explainable scoring:
+    - base score from emotion wheel
+    - word cues +/- adjustments
+    - intensifier / diminisher + negation handling (see ScorerConfig)
+    - concerning phrase flags
+    """
+    emo = (emotion or "").strip().lower()
+    lex = lexicon or current_lexicon()
+    score, bits, hits = _score(
+        emo,
+        scan(text or ""),
+        (text or "").strip().lower(),
+        lex,
+        config or DEFAULT_SCORER,
+    )
+    features = dict(zip(FEATURE_NAMES, hits))
 
     return AnalysisResult(
         emotion=emo if emo else "unknown",
         sentiment_score=_clamp(score),
-        flags=sorted(set(flags)),
+        flags=sorted(name for bit, name in ANALYZER_FLAG_NAMES.items() if bits & bit),
         features=features,
+        lexicon_version=lex.version(),
     )
+
+
+def score_checkin(
+    emotion: str,
+    text: str,
+    lexicon: Optional[Lexicon] = None,
+    config: Optional[ScorerConfig] = None,
+) -> Tuple[float, int]:
+    """
+    Decision-only variant of analyze_checkin.
+
+    Returns (sentiment_score, analyzer flag bits) without building the flag
+    list or an AnalysisResult.
+    """
+    return score_tokens(emotion, scan(text or ""), (text or "").strip().lower(), lexicon, config)
+
+
+def score_tokens(
+    emotion: str,
+    tokens: List[str],
+    lowered: str,
+    lexicon: Optional[Lexicon] = None,
+    config: Optional[ScorerConfig] = None,
+) -> Tuple[float, int]:
+    """score_checkin on pre-scanned text (scan(text), text.strip().lower())."""
+    score, bits, _ = _score(
+        (emotion or "").strip().lower(),
+        tokens,
+        lowered,
+        lexicon or current_lexicon(),
+        config or DEFAULT_SCORER,
+    )
+    return _clamp(score), bits
+
+
+# -------------------------
+# Segmented mode (multi-sentence entries)
+# -------------------------
+
+_SEGMENT_RE = re.compile(r"[a-zA-Z']+|[.,;:!?]+|\n")
+_SENTENCE_END_CHARS = frozenset(".!?\n")
+
+
+@dataclass
+class SentenceScore:
+    text: str                 # sentence as written (stripped)
+    sentiment_score: float
+    flags: List[str]
+    phrase_hits: List[str]    # concerning phrases found in this sentence
+
+
+@dataclass
+class SegmentedAnalysis:
+    emotion: str
+    sentiment_score: float    # sentence scores combined with `aggregation`
+    aggregation: str
+    flags: List[str]
+    features: Dict[str, int]  # summed over sentences
+    sentences: List[SentenceScore]
+    lexicon_version: str = ""
+
+    def analysis(self) -> AnalysisResult:
+        """Entry-level view for the rule engine (assess_risk / decide)."""
+        return AnalysisResult(
+            emotion=self.emotion,
+            sentiment_score=self.sentiment_score,
+            flags=list(self.flags),
+            features=dict(self.features),
+            lexicon_version=self.lexicon_version,
+        )
+
+
+AGGREGATIONS = {
+    "min": min,
+    "mean": lambda xs: sum(xs) / len(xs),
+    "last": lambda xs: xs[-1],
+}
+
+
+def split_sentences(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    One pass over `text` returning (sentence, scan tokens) pairs. Sentences
+    end at . ! ? runs or line breaks; fragments without words are dropped.
+    """
+    out: List[Tuple[str, List[str]]] = []
+    tokens: List[str] = []
+    start = 0
+    for m in _SEGMENT_RE.finditer(text):
+        tok = m.group(0)
+        if tok != "\n":
+            tokens.append(tok.lower())
+        if tok[0] in _BOUNDARY_CHARS or tok == "\n":
+            if not _SENTENCE_END_CHARS.intersection(tok):
+                continue
+            if any(t[0] not in _BOUNDARY_CHARS for t in tokens):
+                out.append((text[start:m.end()].strip(), tokens))
+            tokens = []
+            start = m.end()
+    if any(t[0] not in _BOUNDARY_CHARS for t in tokens):
+        out.append((text[start:].strip(), tokens))
+    return out
+
+
+def _match_phrases(tokens: List[str], index: Mapping[str, Tuple[Tuple[Tuple[str, ...], str], ...]]) -> List[str]:
+    # `tokens` keep punctuation runs, which never equal a phrase word, so a
+    # phrase cannot match across a comma (as with the substring search).
+    hits: List[str] = []
+    for i, w in enumerate(tokens):
+        for phrase_words, phrase in index.get(w, ()):
+            if tuple(tokens[i:i + len(phrase_words)]) == phrase_words and phrase not in hits:
+                hits.append(phrase)
+    return hits
+
+
+def analyze_segmented(
+    entries: Sequence[Tuple[str, str]],
+    aggregation: str = "min",
+    lexicon: Optional[Lexicon] = None,
+    config: Optional[ScorerConfig] = None,
+) -> List[SegmentedAnalysis]:
+    """
+    Sentence-level scoring for a batch of (emotion, text) entries.
+
+    Every entry is split into sentences in one pass, then all sentences of
+    all entries are scored as one flat batch: each sentence is scored like a
+    check-in of its own (emotion base + its cues), and concerning phrases are
+    matched on word sequences within the sentence (via Lexicon.phrase_index)
+    instead of substring searches over the whole entry. Like the substring
+    search, a phrase never matches across punctuation; unlike it, a phrase
+    must match whole words. The entry score combines the sentence
+    scores with `aggregation` ("min", "mean" or "last"); entry flags are the
+    union of sentence flags, and the unknown-emotion flag uses the entry's
+    total negative hits as in analyze_checkin.
+    """
+    agg = AGGREGATIONS.get(aggregation)
+    if agg is None:
+        raise ValueError(f"Unknown aggregation: {aggregation!r} (expected one of {sorted(AGGREGATIONS)})")
+    lex = lexicon or current_lexicon()
+    cfg = config or DEFAULT_SCORER
+    index = lex.phrase_index()
+    version = lex.version()
+
+    emotions = [(emotion or "").strip().lower() for emotion, _ in entries]
+
+    # Flat batch: owner entry, sentence text and tokens for every sentence.
+    owners: List[int] = []
+    batch: List[Tuple[str, List[str]]] = []
+    for i, (_, text) in enumerate(entries):
+        for sentence in split_sentences(text or ""):
+            owners.append(i)
+            batch.append(sentence)
+
+    per_entry: List[List[SentenceScore]] = [[] for _ in entries]
+    entry_bits = [0] * len(entries)
+    entry_hits = [[0] * len(FEATURE_NAMES) for _ in entries]
+    for owner, (text, tokens) in zip(owners, batch):
+        score, bits, hits = _score(emotions[owner], tokens, "", lex, cfg)
+        phrases = _match_phrases(tokens, index)
+        if phrases:
+            bits |= FLAG_CONCERNING_LANGUAGE
+            hits = hits[:-1] + (len(phrases),)
+        # Decided per entry below, from the entry's total negative hits.
+        bits &= ~FLAG_UNKNOWN_EMOTION_NEGATIVE
+        per_entry[owner].append(SentenceScore(
+            text=text,
+            sentiment_score=_clamp(score),
+            flags=sorted(name for bit, name in ANALYZER_FLAG_NAMES.items() if bits & bit),
+            phrase_hits=phrases,
+        ))
+        entry_bits[owner] |= bits
+        acc = entry_hits[owner]
+        for k, h in enumerate(hits):
+            acc[k] += h
+
+    results: List[SegmentedAnalysis] = []
+    for i, emo in enumerate(emotions):
+        sentences = per_entry[i]
+        bits = entry_bits[i]
+        features = dict(zip(FEATURE_NAMES, entry_hits[i]))
+        if emo not in lex.emotion_base and features["neg_hits"] >= 3:
+            bits |= FLAG_UNKNOWN_EMOTION_NEGATIVE
+        score = agg([s.sentiment_score for s in sentences]) if sentences else _clamp(lex.emotion_base.get(emo, 0.0))
+        results.append(SegmentedAnalysis(
+            emotion=emo if emo else "unknown",
+            sentiment_score=score,
+            aggregation=aggregation,
+            flags=sorted(name for bit, name in ANALYZER_FLAG_NAMES.items() if bits & bit),
+            features=features,
+            sentences=sentences,
+            lexicon_version=version,
+        ))
+    return results
@@ -0,0 +1,91 @@
+# src/bench_scorer.py
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import sysconfig
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .scorer import Scorer
+
+
+def gil_enabled() -> bool:
+    # sys._is_gil_enabled() exists on 3.13+; older builds always have the GIL.
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def run(scorer: Scorer, entries: List[Tuple[str, str]], threads: int, per_thread: int) -> float:
+    """Check-ins per second with `threads` workers each scoring `per_thread` entries."""
+    start = threading.Barrier(threads + 1)
+
+    def work(offset: int) -> None:
+        n = len(entries)
+        start.wait()
+        for i in range(per_thread):
+            emo, text = entries[(offset + i) % n]
+            scorer.decide(emo, text, student_id=f"s{(offset + i) % 997}")
+
+    workers = [threading.Thread(target=work, args=(t * 7919,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for w in workers:
+        w.join()
+    return threads * per_thread / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scorer throughput vs. thread count.")
+    parser.add_argument("--threads", default="1,2,4,8", help="comma-separated thread counts")
+    parser.add_argument("--per-thread", type=int, default=20000, help="check-ins scored by each thread")
+    parser.add_argument("--cache-size", type=int, default=0, help="Scorer cache size (0 = no cache)")
+    args = parser.parse_args()
+
+    from .evaluate import load_corpus
+
+    repo_root = Path(__file__).resolve().parents[1]
+    rows = load_corpus(repo_root / "data" / "youth_corpus.csv")
+    entries = [(r["emotion_hint"], r["text"]) for r in rows if r["text"]]
+    out_dir = repo_root / "results"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    scorer = Scorer(cache_size=args.cache_size, history=True)
+    run(scorer, entries, 1, 1000)  # warm-up
+
+    results: List[Dict] = []
+    base = None
+    for t in (int(x) for x in args.threads.split(",")):
+        rate = run(scorer, entries, t, args.per_thread)
+        base = base or rate
+        results.append({"threads": t, "checkins_per_sec": rate, "speedup": rate / base})
+
+    report = {
+        "python": sys.version.split()[0],
+        "free_threaded_build": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        "gil_enabled": gil_enabled(),
+        "cache_size": args.cache_size,
+        "per_thread": args.per_thread,
+        "results": results,
+    }
+    out_path = out_dir / "scorer_bench.json"
+    out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"Python {report['python']} (free-threaded build: {report['free_threaded_build']}, "
+          f"GIL enabled: {report['gil_enabled']})")
+    for r in results:
+        print(f"- {r['threads']:>2} threads: {r['checkins_per_sec']:>10.0f} check-ins/s  (x{r['speedup']:.2f})")
+    if report["gil_enabled"]:
+        print("Note: with the GIL enabled, throughput will not scale with threads; "
+              "run on a free-threaded build (python3.13t+) to measure scaling.")
+
+    print(f"\nSaved: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
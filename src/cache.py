@@ -0,0 +1,243 @@
+# src/cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .lexicon import current_lexicon
+from .analyzer import ANALYZER_VERSION, DEFAULT_SCORER, AnalysisResult, analyze_checkin
+from .engine import AlertResult, assess_risk
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0          # served from memory or disk
+    misses: int = 0        # had to run analyzer + engine
+    evictions: int = 0     # dropped from the in-process LRU tier
+    disk_hits: int = 0     # subset of hits that came from the disk tier
+    disk_writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _normalize_text(text: str) -> str:
+    # Tokens are lowercased and phrases are matched on text.strip().lower(),
+    # so those two steps never change the result. Non-ASCII text is only
+    # stripped: str.lower() can turn e.g. "İ" into an ASCII "i" the tokenizer
+    # would then pick up.
+    t = (text or "").strip()
+    return t.lower() if t.isascii() else t
+
+
+def cache_key(
+    emotion: str,
+    text: str,
+    watch_threshold: float,
+    alert_threshold: float,
+    lexicon_version: str,
+) -> str:
+    payload = "\x1f".join([
+        (emotion or "").strip().lower(),
+        _normalize_text(text),
+        lexicon_version,
+        f"{ANALYZER_VERSION}:{DEFAULT_SCORER.version()}",
+        repr(float(watch_threshold)),
+        repr(float(alert_threshold)),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _copy(analysis: AnalysisResult, alert: AlertResult) -> Tuple[AnalysisResult, AlertResult]:
+    # Results are mutable dataclasses; hand out copies so callers can't
+    # corrupt what other callers will be served.
+    return (
+        replace(analysis, flags=list(analysis.flags), features=dict(analysis.features)),
+        replace(alert, flags=list(alert.flags), explanation=list(alert.explanation)),
+    )
+
+
+class ResultCache:
+    """
+    Content-addressed cache around analyze_checkin + assess_risk.
+
+    Entries are keyed by a hash of the normalized text, emotion, lexicon
+    version, analyzer version and thresholds, so a lexicon, scoring or
+    threshold change never serves a stale result. Only history-free scoring
+    (no recent_scores) is cached, since Rule D depends on per-student history.
+
+    Tiers:
+      - in-process LRU, bounded by max_entries
+      - optional on-disk directory (disk_dir) that several worker processes
+        can share; files are written atomically via os.replace. Entries not
+        read or written for disk_max_age seconds are deleted by prune(), which
+        also runs on one prefix directory every PRUNE_EVERY disk writes, so
+        keys orphaned by a lexicon or threshold change do not pile up.
+
+    One instance can be shared between threads: the LRU tier and stats are
+    guarded by a per-instance lock (scoring itself runs outside it).
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        disk_dir: Optional[Path] = None,
+        disk_max_age: Optional[float] = 7 * 24 * 3600.0,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.disk_max_age = disk_max_age
+        self.stats = CacheStats()
+        self._mem: "OrderedDict[str, Tuple[AnalysisResult, AlertResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the disk tier is left untouched)."""
+        with self._lock:
+            self._mem.clear()
+
+    def checkin(
+        self,
+        emotion: str,
+        text: str,
+        watch_threshold: float = -0.45,
+        alert_threshold: float = -0.75,
+    ) -> Tuple[AnalysisResult, AlertResult]:
+        lex = current_lexicon()
+        key = cache_key(emotion, text, watch_threshold, alert_threshold, lex.version())
+
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                self._mem.move_to_end(key)
+                self.stats.hits += 1
+        if hit is not None:
+            return _copy(*hit)
+
+        hit = self._disk_get(key)
+        if hit is not None:
+            with self._lock:
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+            self._mem_put(key, hit)
+            return _copy(*hit)
+
+        with self._lock:
+            self.stats.misses += 1
+        analysis = analyze_checkin(emotion, text, lexicon=lex)
+        alert = assess_risk(
+            analysis,
+            recent_scores=[],
+            watch_threshold=watch_threshold,
+            alert_threshold=alert_threshold,
+        )
+        self._mem_put(key, (analysis, alert))
+        self._disk_put(key, analysis, alert)
+        return _copy(analysis, alert)
+
+    # -------------------------
+    # Tiers
+    # -------------------------
+
+    def _mem_put(self, key: str, value: Tuple[AnalysisResult, AlertResult]) -> None:
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str) -> Optional[Tuple[AnalysisResult, AlertResult]]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            data: Dict = json.loads(path.read_text(encoding="utf-8"))
+            hit = AnalysisResult(**data["analysis"]), AlertResult(**data["alert"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, half-written by an older writer, or from an
+            # incompatible schema: treat as a miss and overwrite later.
+            return None
+        try:
+            os.utime(path)   # keep recently used entries out of prune()
+        except OSError:
+            pass
+        return hit
+
+    def _disk_put(self, key: str, analysis: AnalysisResult, alert: AlertResult) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"analysis": asdict(analysis), "alert": asdict(alert)}, ensure_ascii=False)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except OSError:
+            # The disk tier is best-effort; never fail scoring because of it.
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.stats.disk_writes += 1
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= self.PRUNE_EVERY
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune(prefixes=[key[:2]])
+
+    def prune(self, max_age: Optional[float] = None, prefixes: Optional[List[str]] = None) -> int:
+        """
+        Delete disk entries not used for `max_age` seconds (default
+        disk_max_age), in all prefix directories or only the given ones.
+        Safe to run while other processes use the directory. Returns the
+        number of files removed.
+        """
+        max_age = self.disk_max_age if max_age is None else max_age
+        if self.disk_dir is None or max_age is None:
+            return 0
+        cutoff = time.time() - max_age
+        dirs = [self.disk_dir / p for p in prefixes] if prefixes is not None else [
+            d for d in self.disk_dir.iterdir() if d.is_dir()
+        ]
+        removed = 0
+        for d in dirs:
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for e in entries:
+                try:
+                    if e.stat().st_mtime < cutoff:
+                        os.unlink(e.path)
+                        removed += 1
+                except OSError:
+                    pass   # raced with another process
+        return removed
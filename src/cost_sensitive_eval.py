@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 
 from .run_experiments import (
+    cm_from_counts,
     load_corpus,
     predict_emotion_only,
     predict_text_lexicon_only,
@@ -92,6 +93,29 @@ def evaluate_cost(exp_name: str, rows: List[Dict[str, str]]) -> Dict:
     }
 
 
+def cost_report(name: str, counts: Dict[str, int]) -> Dict:
+    """Same fields as evaluate_cost, rebuilt from {"true->pred": n} counts."""
+    cm = cm_from_counts(counts)
+    n = sum(cm.values())
+    by_true: Dict[str, float] = {c: 0.0 for c in LABELS}
+    by_pair: Dict[str, float] = {}
+    for (t, p), k in cm.items():
+        c = cost_of(t, p) * k
+        by_true[t] += c
+        if t != p:
+            by_pair[f"{t}->{p}"] = c
+    total_cost = sum(by_true.values())
+    return {
+        "name": name,
+        "n": n,
+        "total_cost": total_cost,
+        "avg_cost_per_entry": total_cost / n if n else 0.0,
+        "by_true_label_cost": by_true,
+        "by_error_pair_cost": dict(sorted(by_pair.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "cost_matrix": {f"{k[0]}->{k[1]}": v for k, v in COSTS.items()},
+    }
+
+
 def main() -> None:
     repo_root = Path(__file__).resolve().parents[1]
     corpus_path = repo_root / "data" / "youth_corpus.csv"
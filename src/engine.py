@@ -2,9 +2,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 
-from .analyzer import AnalysisResult
+from .analyzer import (
+    AnalysisResult,
+    ANALYZER_FLAG_BITS,
+    ANALYZER_FLAG_NAMES,
+    FLAG_CONCERNING_LANGUAGE,
+    FLAG_STRONG_NEGATIVE_SIGNAL,
+    score_checkin,
+)
+from .lexicon import Lexicon, current_lexicon
 
 
 @dataclass
@@ -13,96 +21,229 @@ class AlertResult:
     flags: List[str]              # merged flags (from analyzer + engine rules)
     explanation: List[str]        # human-readable reasons
     suggested_action: str         # non-diagnostic next step
-
-
-def assess_risk(
-    current: AnalysisResult,
+    lexicon_version: str = ""     # Lexicon.version() the analysis was scored with
+
+
+# -------------------------
+# Decision-only fast path
+# -------------------------
+
+RISK_LEVELS = ("safe", "watch", "alert")
+RISK_SAFE, RISK_WATCH, RISK_ALERT = 0, 1, 2
+
+# Engine flag bits continue after the analyzer's (see analyzer.FLAG_*).
+FLAG_NEEDS_HUMAN_REVIEW = 1 << 3
+FLAG_VERY_NEGATIVE_ENTRY = 1 << 4
+FLAG_NEGATIVE_CUES_CLUSTER = 1 << 5
+FLAG_PERSISTENT_NEGATIVE_PATTERN = 1 << 6
+FLAG_WATCH_THRESHOLD_TRIGGERED = 1 << 7
+
+# Rule order (A..E) == explanation order.
+_ENGINE_RULES = (
+    (FLAG_NEEDS_HUMAN_REVIEW, "needs_human_review",
+     "Journal contains concerning phrases that warrant human review."),
+    (FLAG_VERY_NEGATIVE_ENTRY, "very_negative_entry",
+     "Current check-in is strongly negative (low sentiment score)."),
+    (FLAG_NEGATIVE_CUES_CLUSTER, "negative_cues_cluster",
+     "Multiple negative cues detected in the journal text."),
+    (FLAG_PERSISTENT_NEGATIVE_PATTERN, "persistent_negative_pattern",
+     "Negative mood appears repeatedly across recent check-ins."),
+    (FLAG_WATCH_THRESHOLD_TRIGGERED, "watch_threshold_triggered",
+     "Sentiment score crosses the watch threshold."),
+)
+
+FLAG_NAMES: Dict[int, str] = dict(ANALYZER_FLAG_NAMES)
+FLAG_NAMES.update({bit: name for bit, name, _ in _ENGINE_RULES})
+FLAG_BITS: Dict[str, int] = {v: k for k, v in FLAG_NAMES.items()}
+
+_ENGINE_MASK = 0
+for _bit, _, _ in _ENGINE_RULES:
+    _ENGINE_MASK |= _bit
+
+# Rule letter -> the engine flag it raises; used to switch rules off
+# (see disabled_rules_mask).
+RULE_BITS: Dict[str, int] = dict(zip("ABCDE", (bit for bit, _, _ in _ENGINE_RULES)))
+
+
+def disabled_rules_mask(rules) -> int:
+    """Turn rule letters (e.g. {"C", "D"}) into a disabled_rules bitmask."""
+    mask = 0
+    for r in rules:
+        if r not in RULE_BITS:
+            raise ValueError(f"Unknown rule: {r}")
+        mask |= RULE_BITS[r]
+    return mask
+
+# Rule D: at least PERSISTENCE_MIN_NEGATIVE of the last PERSISTENCE_WINDOW
+# entries (current included) score below NEGATIVE_SCORE.
+PERSISTENCE_WINDOW = 5
+PERSISTENCE_MIN_NEGATIVE = 3
+NEGATIVE_SCORE = -0.25
+
+_ACTIONS = (
+    "No action needed; continue regular check-ins.",
+    "Recommend monitoring and a supportive check-in if patterns continue.",
+    "Recommend a timely counselor check-in and human review of the entry.",
+)
+_NO_EXPLANATION = "No concerning patterns detected in this check-in."
+
+
+class Decision(NamedTuple):
+    risk: int      # index into RISK_LEVELS
+    flags: int     # analyzer + engine flag bits (see FLAG_NAMES)
+    lexicon_version: str = ""
+
+
+def decide_score(
+    score: float,
+    flags: int = 0,
     recent_scores: Optional[List[float]] = None,
-    recent_flags: Optional[List[List[str]]] = None,
-    watch_threshold: float = -0.45,   
+    watch_threshold: float = -0.45,
     alert_threshold: float = -0.75,
-) -> AlertResult:
+    disabled_rules: int = 0,
+    persistent: Optional[bool] = None,
+    lexicon_version: str = "",
+) -> Decision:
     """
-    Explainable rule-based engine.
+    Apply the rule engine to a sentiment score and analyzer flag bits.
 
-    Inputs:
-      - current: analysis of current check-in
-      - recent_scores: previous sentiment scores (most recent last), optional
-      - recent_flags: previous flags list per entry, optional
-
-    Output:
-      - risk_level + explanation + suggested_action
+    Same rules as assess_risk, but only returns the risk code and flag bits;
+    use explain() to get the full AlertResult. `disabled_rules` is a mask
+    from disabled_rules_mask() for evaluating rule ablations. `persistent`
+    is a precomputed Rule D outcome (e.g. from a vectorized history replay);
+    when given, recent_scores is ignored.
     """
-    recent_scores = recent_scores or []
-    recent_flags = recent_flags or []
-
-    explanation: List[str] = []
-    engine_flags: List[str] = []
-
-    score = current.sentiment_score
+    bits = flags
 
     # Rule A: concerning language => alert (human review)
-    if "concerning_language" in current.flags:
-        engine_flags.append("needs_human_review")
-        explanation.append("Journal contains concerning phrases that warrant human review.")
+    if flags & FLAG_CONCERNING_LANGUAGE:
+        bits |= FLAG_NEEDS_HUMAN_REVIEW
 
     # Rule B: very low score
     if score <= alert_threshold:
-        engine_flags.append("very_negative_entry")
-        explanation.append("Current check-in is strongly negative (low sentiment score).")
+        bits |= FLAG_VERY_NEGATIVE_ENTRY
 
     # Rule C: strong negative signal from analyzer
-    if "strong_negative_signal" in current.flags:
-        engine_flags.append("negative_cues_cluster")
-        explanation.append("Multiple negative cues detected in the journal text.")
+    if flags & FLAG_STRONG_NEGATIVE_SIGNAL:
+        bits |= FLAG_NEGATIVE_CUES_CLUSTER
 
     # Rule D: persistence over recent history (e.g., 3+ negatives in last 5)
-    window = recent_scores[-4:] + [score]  # include current; up to 5 entries
-    neg_count = sum(1 for s in window if s < -0.25)
-    if len(window) >= 5 and neg_count >= 3:
-        engine_flags.append("persistent_negative_pattern")
-        explanation.append("Negative mood appears repeatedly across recent check-ins.")
-
-    # Rule E: moderate negative score => watch
-    # if -0.55 <= score <= -0.30:
-    #     engine_flags.append("moderate_negative_entry")
-    #     explanation.append("Overall sentiment indicates moderate and persistent negativity.")
+    if persistent is not None:
+        if persistent:
+            bits |= FLAG_PERSISTENT_NEGATIVE_PATTERN
+    elif recent_scores and len(recent_scores) >= PERSISTENCE_WINDOW - 1:
+        window = recent_scores[-(PERSISTENCE_WINDOW - 1):]  # plus current
+        neg_count = sum(1 for s in window if s < NEGATIVE_SCORE) + (score < NEGATIVE_SCORE)
+        if neg_count >= PERSISTENCE_MIN_NEGATIVE:
+            bits |= FLAG_PERSISTENT_NEGATIVE_PATTERN
 
     # Rule E: watch threshold on single entry
     if score <= watch_threshold:
-        engine_flags.append("watch_threshold_triggered")
-        explanation.append("Sentiment score crosses the watch threshold.")
+        bits |= FLAG_WATCH_THRESHOLD_TRIGGERED
 
-    # Determine risk level (simple priority)
-    if "needs_human_review" in engine_flags:
-        risk = "alert"
-    elif (
-        score <= alert_threshold
-        or "persistent_negative_pattern" in engine_flags
-        or "watch_threshold_triggered" in engine_flags
-    ):
-        risk = "watch"
+    bits &= ~disabled_rules
 
+    # Determine risk level (simple priority)
+    if bits & FLAG_NEEDS_HUMAN_REVIEW:
+        risk = RISK_ALERT
+    elif bits & (FLAG_VERY_NEGATIVE_ENTRY | FLAG_PERSISTENT_NEGATIVE_PATTERN | FLAG_WATCH_THRESHOLD_TRIGGERED):
+        risk = RISK_WATCH
     else:
-        risk = "safe"
+        risk = RISK_SAFE
 
-    # Suggested action (non-diagnostic)
-    if risk == "alert":
-        action = "Recommend a timely counselor check-in and human review of the entry."
-    elif risk == "watch":
-        action = "Recommend monitoring and a supportive check-in if patterns continue."
-    else:
-        action = "No action needed; continue regular check-ins."
+    return Decision(risk, bits, lexicon_version)
+
+
+def decide(
+    current: AnalysisResult,
+    recent_scores: Optional[List[float]] = None,
+    watch_threshold: float = -0.45,
+    alert_threshold: float = -0.75,
+) -> Decision:
+    """Decision-only counterpart of assess_risk for an existing AnalysisResult."""
+    flags = 0
+    for f in current.flags:
+        flags |= ANALYZER_FLAG_BITS.get(f, 0)
+    return decide_score(
+        current.sentiment_score,
+        flags,
+        recent_scores,
+        watch_threshold,
+        alert_threshold,
+        lexicon_version=current.lexicon_version,
+    )
+
+
+def decide_checkin(
+    emotion: str,
+    text: str,
+    recent_scores: Optional[List[float]] = None,
+    watch_threshold: float = -0.45,
+    alert_threshold: float = -0.75,
+    lexicon: Optional[Lexicon] = None,
+) -> Decision:
+    """
+    Analyzer + engine without explanation assembly.
+
+    Bulk consumers (sweeps, cost evaluation) only need the risk code:
+    RISK_LEVELS[decide_checkin(...).risk].
+    """
+    lex = lexicon or current_lexicon()
+    score, flags = score_checkin(emotion, text, lex)
+    return decide_score(
+        score,
+        flags,
+        recent_scores,
+        watch_threshold,
+        alert_threshold,
+        lexicon_version=lex.version(),
+    )
 
-    merged_flags = sorted(set(current.flags + engine_flags))
+
+def _build_alert(risk: int, engine_bits: int, analyzer_flags: List[str], lexicon_version: str) -> AlertResult:
+    explanation: List[str] = []
+    engine_flags: List[str] = []
+    for bit, name, reason in _ENGINE_RULES:
+        if engine_bits & bit:
+            engine_flags.append(name)
+            explanation.append(reason)
 
     # If nothing triggered, still provide a minimal explanation
     if not explanation:
-        explanation.append("No concerning patterns detected in this check-in.")
+        explanation.append(_NO_EXPLANATION)
 
     return AlertResult(
-        risk_level=risk,
-        flags=merged_flags,
+        risk_level=RISK_LEVELS[risk],
+        flags=sorted(set(analyzer_flags + engine_flags)),
         explanation=explanation,
-        suggested_action=action,
+        suggested_action=_ACTIONS[risk],
+        lexicon_version=lexicon_version,
     )
+
+
+def explain(decision: Decision) -> AlertResult:
+    """Rebuild the full AlertResult (same text as assess_risk) from a Decision."""
+    analyzer_flags = [name for bit, name in ANALYZER_FLAG_NAMES.items() if decision.flags & bit]
+    return _build_alert(decision.risk, decision.flags & _ENGINE_MASK, analyzer_flags, decision.lexicon_version)
+
+
+def assess_risk(
+    current: AnalysisResult,
+    recent_scores: Optional[List[float]] = None,
+    recent_flags: Optional[List[List[str]]] = None,
+    watch_threshold: float = -0.45,   
+    alert_threshold: float = -0.75,
+) -> AlertResult:
+    """
+    Explainable rule-based engine.
+
+    Inputs:
+      - current: analysis of current check-in
+      - recent_scores: previous sentiment scores (most recent last), optional
+      - recent_flags: previous flags list per entry, optional
+
+    Output:
+      - risk_level + explanation + suggested_action
+    """
+    d = decide(current, recent_scores, watch_threshold, alert_threshold)
+    return _build_alert(d.risk, d.flags & _ENGINE_MASK, list(current.flags), d.lexicon_version)
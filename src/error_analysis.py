@@ -0,0 +1,186 @@
+# src/error_analysis.py
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .analyzer import tokenize
+from .engine import RISK_LEVELS, decide_checkin
+from .lexicon import current_lexicon
+
+
+_CODE = {r: i for i, r in enumerate(RISK_LEVELS)}
+_NPAIRS = len(RISK_LEVELS) * len(RISK_LEVELS)
+
+
+def _pair_code(y_true: str, y_pred: str) -> int:
+    return _CODE[y_true] * len(RISK_LEVELS) + _CODE[y_pred]
+
+
+def _parse_pair(pair: str) -> int:
+    t, p = pair.split("->")
+    return _pair_code(t, p)
+
+
+def row_features(text: str, emotion: str) -> List[str]:
+    """Index keys for one entry: tok:<token>, phrase:<phrase>, emo:<emotion>."""
+    lowered = (text or "").strip().lower()
+    feats = {f"tok:{t}" for t in tokenize(lowered)}
+    feats.update(f"phrase:{p}" for p in current_lexicon().concerning_phrases if p in lowered)
+    feats.add(f"emo:{(emotion or '').strip().lower() or 'unknown'}")
+    return sorted(feats)
+
+
+def _intersect(small: array, large: array) -> array:
+    """Rows in both ascending posting lists (galloping search through `large`)."""
+    out = array("I")
+    n = len(large)
+    lo = 0
+    for x in small:
+        # Gallop from the last position, then binary search the bracket.
+        hi, step = lo, 1
+        while hi < n and large[hi] < x:
+            lo = hi + 1
+            hi += step
+            step <<= 1
+        lo = bisect_left(large, x, lo, min(hi, n))
+        if lo == n:
+            break
+        if large[lo] == x:
+            out.append(x)
+            lo += 1
+    return out
+
+
+class ErrorIndex:
+    """
+    Inverted index from token / phrase / emotion to evaluated rows.
+
+    Each row stores its (true, pred) pair as one byte; each feature and each
+    pair keeps an ascending posting list of row numbers, and each feature
+    per-pair counts. Ranking features for an error pair (e.g. "alert->safe")
+    costs O(#features); filtered row queries intersect the posting lists
+    involved, shortest first, without touching the rest of the corpus.
+    """
+
+    def __init__(self) -> None:
+        self._pairs = bytearray()                 # row -> pair code
+        self._row_ids = array("q")                # row -> caller's row id
+        self._postings: Dict[str, array] = {}     # feature -> rows (ascending)
+        self._pair_rows = [array("I") for _ in range(_NPAIRS)]  # pair code -> rows (ascending)
+        self._feature_pairs: Dict[str, array] = {}  # feature -> counts per pair code
+        self._pair_totals = array("q", [0] * _NPAIRS)
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def add(self, row_id: int, y_true: str, y_pred: str, features: Iterable[str]) -> None:
+        row = len(self._pairs)
+        code = _pair_code(y_true, y_pred)
+        self._pairs.append(code)
+        self._row_ids.append(row_id)
+        self._pair_totals[code] += 1
+        self._pair_rows[code].append(row)
+        for f in features:
+            posting = self._postings.get(f)
+            if posting is None:
+                posting = self._postings[f] = array("I")
+                self._feature_pairs[f] = array("q", [0] * _NPAIRS)
+            posting.append(row)
+            self._feature_pairs[f][code] += 1
+
+    def pair_counts(self, feature: Optional[str] = None) -> Dict[str, int]:
+        counts = self._pair_totals if feature is None else self._feature_pairs.get(feature)
+        if counts is None:
+            return {}
+        n = len(RISK_LEVELS)
+        return {
+            f"{RISK_LEVELS[c // n]}->{RISK_LEVELS[c % n]}": counts[c]
+            for c in range(_NPAIRS) if counts[c]
+        }
+
+    def query(self, features: Iterable[str] = (), pair: Optional[str] = None) -> List[int]:
+        """Caller row ids having all `features` (and, optionally, the given error pair)."""
+        lists = [self._postings.get(f, array("I")) for f in features]
+        if pair is not None:
+            lists.append(self._pair_rows[_parse_pair(pair)])
+        if not lists:
+            return list(self._row_ids)
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not rows:
+                break
+            rows = _intersect(rows, other)
+        return [self._row_ids[r] for r in rows]
+
+    def rank(self, pair: str, kind: str = "tok", min_support: int = 2, top: int = 20) -> List[Dict]:
+        """
+        Features of one kind ("tok", "phrase", "emo") ranked by how many
+        `pair` errors they account for beyond the corpus-wide rate:
+          excess = in_pair - support * base_rate
+        """
+        code = _parse_pair(pair)
+        total = len(self._pairs)
+        base_rate = self._pair_totals[code] / total if total else 0.0
+        prefix = f"{kind}:"
+
+        out: List[Dict] = []
+        for f, counts in self._feature_pairs.items():
+            if not f.startswith(prefix):
+                continue
+            in_pair = counts[code]
+            support = len(self._postings[f])
+            if not in_pair or support < min_support:
+                continue
+            rate = in_pair / support
+            out.append({
+                "feature": f[len(prefix):],
+                "in_pair": in_pair,
+                "support": support,
+                "rate": rate,
+                "lift": rate / base_rate if base_rate else 0.0,
+                "excess": in_pair - support * base_rate,
+            })
+        out.sort(key=lambda d: (-d["excess"], -d["in_pair"], d["feature"]))
+        return out[:top]
+
+
+def build_index(rows: List[Dict[str, str]]) -> ErrorIndex:
+    """Score the hybrid system (C) on `rows` and index every evaluated entry."""
+    index = ErrorIndex()
+    for i, r in enumerate(rows):
+        text = r["text"]
+        emo = r["emotion_hint"]
+        yt = r["risk_label"]
+        if yt not in _CODE or not text:
+            continue
+        yp = RISK_LEVELS[decide_checkin(emo, text).risk]
+        index.add(i, yt, yp, row_features(text, emo))
+    return index
+
+
+def main() -> None:
+    from .evaluate import load_corpus
+
+    repo_root = Path(__file__).resolve().parents[1]
+    corpus_path = repo_root / "data" / "youth_corpus.csv"
+    rows = load_corpus(corpus_path)
+    index = build_index(rows)
+
+    print(f"Indexed {len(index)} rows (Hybrid C)")
+    for pair, n in sorted(index.pair_counts().items(), key=lambda kv: -kv[1]):
+        t, p = pair.split("->")
+        if t == p:
+            continue
+        print(f"\n{pair}: {n} rows")
+        for kind in ("tok", "phrase", "emo"):
+            ranked = index.rank(pair, kind=kind, min_support=1, top=5)
+            if ranked:
+                print(f"  {kind}: " + ", ".join(f"{d['feature']} ({d['in_pair']}/{d['support']})" for d in ranked))
+
+
+if __name__ == "__main__":
+    main()
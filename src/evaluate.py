@@ -6,8 +6,8 @@ from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from .analyzer import analyze_checkin
-from .engine import assess_risk
+from .engine import RISK_LEVELS, decide_checkin
+from .error_analysis import ErrorIndex, row_features
 
 
 ALLOWED = {"safe", "watch", "alert"}
@@ -60,6 +60,7 @@ def main() -> None:
 
     y_true: List[str] = []
     y_pred: List[str] = []
+    used_rows: List[Dict[str, str]] = []
     bad_rows = 0
 
     # For now: no history; pure single-entry evaluation baseline
@@ -72,11 +73,9 @@ def main() -> None:
             bad_rows += 1
             continue
 
-        analysis = analyze_checkin(emo, text)
-        alert = assess_risk(analysis, recent_scores=[])
-
         y_true.append(label)
-        y_pred.append(alert.risk_level)
+        y_pred.append(RISK_LEVELS[decide_checkin(emo, text).risk])
+        used_rows.append(r)
 
     total = len(y_true)
     correct = sum(1 for a, b in zip(y_true, y_pred) if a == b)
@@ -91,7 +90,7 @@ def main() -> None:
     # Show a few mistakes for iteration
     print("\nSample mistakes (up to 10):")
     shown = 0
-    for r, yt, yp in zip(rows, y_true, y_pred):
+    for r, yt, yp in zip(used_rows, y_true, y_pred):
         if yt != yp:
             shown += 1
             print("-" * 60)
@@ -102,6 +101,20 @@ def main() -> None:
 
     if shown == 0:
         print("No mistakes in this run (small dataset / lucky baseline).")
+        return
+
+    # Which tokens / phrases / emotions account for each error pair
+    index = ErrorIndex()
+    for i, (r, yt, yp) in enumerate(zip(used_rows, y_true, y_pred)):
+        index.add(i, yt, yp, row_features(r["text"], r["emotion_hint"]))
+
+    print("\nError attribution (top tokens per error pair):")
+    for pair, n in sorted(index.pair_counts().items(), key=lambda kv: -kv[1]):
+        t, p = pair.split("->")
+        if t == p:
+            continue
+        ranked = index.rank(pair, kind="tok", min_support=1, top=5)
+        print(f"- {pair} ({n}): " + ", ".join(f"{d['feature']} ({d['in_pair']}/{d['support']})" for d in ranked))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+# src/incremental_eval.py
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .lexicon import Lexicon, current_lexicon
+from .analyzer import ANALYZER_VERSION, DEFAULT_SCORER, score_checkin
+from .cost_sensitive_eval import cost_of, cost_report
+from .engine import RISK_LEVELS, decide_checkin, decide_score
+from .run_experiments import (
+    LABELS,
+    cm_from_counts,
+    experiment_report,
+    parse_corpus,
+    predict_emotion_only,
+)
+from .threshold_sweep import THRESHOLDS, recall_for, safe_div
+
+
+# Bump when the checkpoint layout changes (scoring changes are tracked by
+# analyzer.ANALYZER_VERSION).
+CHECKPOINT_VERSION = 1
+
+EXPERIMENTS = ["A_emotion_only", "B_text_only", "C_hybrid"]
+WATCH_THRESHOLD = -0.45
+ALERT_THRESHOLD = -0.75
+
+Counts = Dict[str, int]  # "true->pred" -> count
+
+
+def eval_config(thresholds: List[float], lexicon: Lexicon) -> Dict:
+    """Everything that, if changed, invalidates stored counts."""
+    return {
+        "checkpoint_version": CHECKPOINT_VERSION,
+        "lexicon_version": lexicon.version(),
+        "analyzer_version": ANALYZER_VERSION,
+        "scorer": DEFAULT_SCORER.version(),
+        "watch_threshold": WATCH_THRESHOLD,
+        "alert_threshold": ALERT_THRESHOLD,
+        "sweep_thresholds": list(thresholds),
+    }
+
+
+def empty_checkpoint(thresholds: List[float], lexicon: Lexicon) -> Dict:
+    return {
+        "config": eval_config(thresholds, lexicon),
+        "byte_offset": 0,
+        "prefix_sha256": hashlib.sha256(b"").hexdigest(),
+        "rows": 0,
+        "experiments": {name: {} for name in EXPERIMENTS},
+        "sweep": {repr(t): {} for t in thresholds},
+    }
+
+
+def _bump(counts: Counts, y_true: str, y_pred: str) -> None:
+    key = f"{y_true}->{y_pred}"
+    counts[key] = counts.get(key, 0) + 1
+
+
+def score_rows(ckpt: Dict, rows: List[Dict[str, str]], thresholds: List[float], lexicon: Lexicon) -> None:
+    """Add the predictions for `rows` to the counts stored in `ckpt`."""
+    exp = ckpt["experiments"]
+    sweep = ckpt["sweep"]
+    sweep_keys = [(t, repr(t)) for t in thresholds]
+
+    for r in rows:
+        text = r["text"]
+        emo = r["emotion_hint"]
+        yt = r["risk_label"]
+        if yt not in LABELS or not text:
+            continue
+
+        _bump(exp["A_emotion_only"], yt, predict_emotion_only(emo))
+        _bump(exp["B_text_only"], yt, RISK_LEVELS[decide_checkin("", text, lexicon=lexicon).risk])
+
+        score, flags = score_checkin(emo, text, lexicon)
+        hybrid = decide_score(score, flags, watch_threshold=WATCH_THRESHOLD, alert_threshold=ALERT_THRESHOLD)
+        _bump(exp["C_hybrid"], yt, RISK_LEVELS[hybrid.risk])
+        for thr, key in sweep_keys:
+            d = decide_score(score, flags, watch_threshold=thr, alert_threshold=ALERT_THRESHOLD)
+            _bump(sweep[key], yt, RISK_LEVELS[d.risk])
+
+
+def complete_records_end(data: bytes, start: int = 0) -> int:
+    """
+    Byte offset just past the last complete CSV record in data[start:].
+
+    `start` must be a record boundary. A newline only ends a record when it
+    is outside a quoted field (an even number of quotes since `start`), so a
+    partly written row with an embedded newline waits for the next run.
+    """
+    pos = data.rfind(b"\n", start)
+    while pos != -1 and data.count(b'"', start, pos) % 2:
+        pos = data.rfind(b"\n", start, pos)
+    return pos + 1 if pos != -1 else start
+
+
+def update(corpus_path: Path, ckpt: Optional[Dict], thresholds: List[float] = THRESHOLDS) -> Tuple[Dict, int, bool]:
+    """
+    Bring a checkpoint up to date with the corpus.
+
+    Only rows appended since the checkpoint are scored. Falls back to a full
+    recompute when the already-processed prefix of the file, the lexicon,
+    the thresholds or the checkpoint version changed.
+
+    Returns (checkpoint, rows scored in this call, whether it was a full recompute).
+    """
+    lex = current_lexicon()   # one snapshot for the whole run
+    data = corpus_path.read_bytes()
+
+    full = (
+        ckpt is None
+        or ckpt.get("config") != eval_config(thresholds, lex)
+        or ckpt["byte_offset"] > len(data)
+        or hashlib.sha256(data[:ckpt["byte_offset"]]).hexdigest() != ckpt["prefix_sha256"]
+    )
+    if full:
+        ckpt = empty_checkpoint(thresholds, lex)
+
+    start = ckpt["byte_offset"]
+    # Only consume complete records; a partially written last row waits for
+    # the next run.
+    end = complete_records_end(data, start)
+    if end == 0:
+        rows: List[Dict[str, str]] = []
+    elif start == 0:
+        rows = parse_corpus(io.StringIO(data[:end].decode("utf-8"), newline=""))
+    else:
+        header_end = data.index(b"\n") + 1
+        chunk = (data[:header_end] + data[start:end]).decode("utf-8")
+        rows = parse_corpus(io.StringIO(chunk, newline=""))
+
+    score_rows(ckpt, rows, thresholds, lex)
+    ckpt["byte_offset"] = end
+    ckpt["prefix_sha256"] = hashlib.sha256(data[:end]).hexdigest()
+    ckpt["rows"] += len(rows)
+    return ckpt, len(rows), full
+
+
+# -------------------------
+# Reports from stored counts
+# -------------------------
+
+def sweep_report(thr: float, counts: Counts) -> Dict:
+    """Same fields as one threshold_sweep.sweep entry, rebuilt from counts."""
+    cm = cm_from_counts(counts)
+    n = sum(cm.values())
+    total_cost = sum(cost_of(t, p) * k for (t, p), k in cm.items())
+    return {
+        "watch_threshold": thr,
+        "n": n,
+        "watch_recall": recall_for("watch", cm),
+        "alert_recall": recall_for("alert", cm),
+        "total_cost": total_cost,
+        "avg_cost": safe_div(total_cost, n),
+        "confusion_matrix": {f"{a}->{b}": cm.get((a, b), 0) for a in LABELS for b in LABELS},
+    }
+
+
+def build_report(ckpt: Dict, thresholds: List[float] = THRESHOLDS) -> Dict:
+    exp = ckpt["experiments"]
+    return {
+        "metrics": [experiment_report(name, exp[name]) for name in EXPERIMENTS],
+        "cost_metrics": [cost_report(name, exp[name]) for name in EXPERIMENTS],
+        "threshold_sweep": [sweep_report(t, ckpt["sweep"][repr(t)]) for t in thresholds],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental evaluation for append-only corpora.")
+    parser.add_argument("--full", action="store_true", help="ignore the checkpoint and recompute everything")
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    corpus_path = repo_root / "data" / "youth_corpus.csv"
+    out_dir = repo_root / "results"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ckpt_path = out_dir / "eval_checkpoint.json"
+
+    ckpt = None
+    if ckpt_path.exists() and not args.full:
+        ckpt = json.loads(ckpt_path.read_text(encoding="utf-8"))
+
+    ckpt, scored, full = update(corpus_path, ckpt)
+    ckpt_path.write_text(json.dumps(ckpt, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    report = build_report(ckpt)
+    out_path = out_dir / "incremental_metrics.json"
+    out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    mode = "full recompute" if full else "incremental"
+    print(f"{mode}: scored {scored} new rows ({ckpt['rows']} total)")
+    for r in report["metrics"]:
+        print(f"- {r['name']}: n={r['n']}  acc={r['accuracy']:.3f}  macro_f1={r['macro_f1']:.3f}")
+
+    print(f"\nSaved: {ckpt_path}")
+    print(f"Saved: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,301 @@
 # src/lexicon.py
 from __future__ import annotations
 
-# 1) Emotion wheel -> base score (tunable)
-EMOTION_BASE = {
-    "happy": 0.6,
-    "excited": 0.7,
-    "calm": 0.3,
-    "okay": 0.0,
-    "tired": -0.2,
-    "sad": -0.6,
-    "angry": -0.5,
-    "anxious": -0.4,
-    "stressed": -0.4,
-    "numb": -0.3,
-}
-
-# 2) Youth-ish negative / positive cue words (very small starter set)
-POS_WORDS = {
-    "good", "great", "fine", "okay", "ok", "awesome", "better", "happy", "excited", "relieved"
-}
-
-NEG_WORDS = {
-    "bad", "awful", "sad", "angry", "mad", "upset", "tired", "exhausted", "stressed", "anxious",
-    "worried", "scared", "alone", "lonely", "hate", "worthless", "broken"
-}
-
-# 3) Intensifiers / diminishers
-INTENSIFIERS = {"very", "so", "really", "super", "extremely", "totally"}
-DIMINISHERS = {"kinda", "kindof", "sorta", "sortof", "a_bit", "a", "little"}
-
-# 4) Negations
-NEGATIONS = {"not", "dont", "don't", "never", "no", "cant", "can't", "wont", "won't"}
-
-# 5) Concerning phrases
-# NOTE: This is NOT a diagnosis; it's just a flag for human review.
-CONCERNING_PHRASES = {
-    # explicit
-    "i want to disappear",
-    "i don't want to be here",
-    "i dont want to be here",
-    "hurt myself",
-    "hurting myself",
-
-    # implicit / youth-like
-    "no one would care",
-    "nobody would care",
-    "everything feels too heavy",
-    "i can't do this anymore",
-    "i cant do this anymore",
-    "nothing matters anymore",
-    "what's the point",
-}
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
 
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover
+    import tomli as tomllib
+
+# Vocabularies live in data files so they can be updated without a code
+# deploy. The default (src/data/lexicon.toml) ships as package data, so it is
+# present in installed copies too; see that file for the word lists.
+LEXICON_PATH = Path(__file__).resolve().parent / "data" / "lexicon.toml"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Word pattern of analyzer.tokenize, used to split concerning phrases.
+_PHRASE_WORD_RE = re.compile(r"[a-zA-Z']+")
+
+# Bump when the snapshot layout changes. Snapshots are plain JSON (never
+# pickle): the data directory is writable by people who are not deploying
+# code, so loading a snapshot must not be able to run code.
+_SNAPSHOT_FORMAT = 2
+
+
+# Immutable bundle of all vocabularies.
+# The analyzer scores against a Lexicon so alternative vocabularies (e.g.
+# shadow-evaluation candidates or a freshly reloaded file) can be used side
+# by side.
+@dataclass(frozen=True)
+class Lexicon:
+    emotion_base: Mapping[str, float]
+    pos_words: FrozenSet[str]
+    neg_words: FrozenSet[str]
+    intensifiers: FrozenSet[str]
+    diminishers: FrozenSet[str]
+    negations: FrozenSet[str]
+    concerning_phrases: FrozenSet[str]
+    _version: str = field(init=False, repr=False, compare=False, default="")
+    _phrase_index: Optional[Mapping[str, Tuple[Tuple[Tuple[str, ...], str], ...]]] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
+    def __post_init__(self) -> None:
+        # Read-only copy: version() is computed once below, so the scores must
+        # not be editable afterwards (and the Lexicon stays hashable).
+        object.__setattr__(self, "emotion_base", MappingProxyType(dict(self.emotion_base)))
+        payload = json.dumps(
+            {
+                "emotion_base": dict(self.emotion_base),
+                "pos_words": sorted(self.pos_words),
+                "neg_words": sorted(self.neg_words),
+                "intensifiers": sorted(self.intensifiers),
+                "diminishers": sorted(self.diminishers),
+                "negations": sorted(self.negations),
+                "concerning_phrases": sorted(self.concerning_phrases),
+            },
+            sort_keys=True,
+        )
+        object.__setattr__(self, "_version", hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16])
+
+        index: Dict[str, list] = {}
+        for phrase in sorted(self.concerning_phrases):
+            words = tuple(w.lower() for w in _PHRASE_WORD_RE.findall(phrase))
+            if words:
+                index.setdefault(words[0], []).append((words, phrase))
+        object.__setattr__(self, "_phrase_index", MappingProxyType({k: tuple(v) for k, v in index.items()}))
+
+    def version(self) -> str:
+        """Content fingerprint; changes whenever any vocabulary changes."""
+        return self._version
+
+    def phrase_index(self) -> Mapping[str, Tuple[Tuple[Tuple[str, ...], str], ...]]:
+        """Concerning phrases by first word: {word: ((phrase words, phrase), ...)}."""
+        return self._phrase_index
+
+    def __hash__(self) -> int:
+        return hash(self._version)
+
+    def __reduce__(self):
+        # MappingProxyType cannot be pickled or deep-copied; rebuild from a
+        # plain dict (the version and phrase index are recomputed).
+        return (Lexicon, (dict(self.emotion_base),) + tuple(getattr(self, name) for name in _WORD_FIELDS))
+
+    def adjusted(
+        self,
+        add: Optional[Mapping[str, Iterable[str]]] = None,
+        remove: Optional[Mapping[str, Iterable[str]]] = None,
+        emotion_base: Optional[Mapping[str, float]] = None,
+    ) -> "Lexicon":
+        """
+        Copy with words added to / removed from the named vocabularies
+        (e.g. add={"neg_words": ["drained"]}) and emotion scores overridden.
+        """
+        changes: Dict[str, object] = {}
+        for name in set(add or {}) | set(remove or {}):
+            if name not in _WORD_FIELDS:
+                raise ValueError(f"Unknown vocabulary: {name}")
+            words = set(getattr(self, name))
+            words |= set((add or {}).get(name, ()))
+            words -= set((remove or {}).get(name, ()))
+            changes[name] = frozenset(words)
+        if emotion_base:
+            changes["emotion_base"] = {**self.emotion_base, **emotion_base}
+        return replace(self, **changes)
+
+
+_WORD_FIELDS = (
+    "pos_words",
+    "neg_words",
+    "intensifiers",
+    "diminishers",
+    "negations",
+    "concerning_phrases",
+)
+
+
+# -------------------------
+# Loading from data files
+# -------------------------
+
+def parse_lexicon(data: Mapping) -> Lexicon:
+    """
+    Build a Lexicon from the parsed contents of a JSON / TOML lexicon file.
+
+    Raises ValueError for anything that is not the schema 1 layout: word
+    lists must be lists of strings and emotion_base values numbers.
+    """
+    if not isinstance(data, Mapping) or data.get("schema") != 1:
+        schema = data.get("schema") if isinstance(data, Mapping) else None
+        raise ValueError(f"Unsupported lexicon schema: {schema!r}")
+    words = data.get("words") or {}
+    if not isinstance(words, Mapping):
+        raise ValueError("Lexicon 'words' must be a table of word lists")
+    missing = [name for name in _WORD_FIELDS if name not in words]
+    if missing:
+        raise ValueError(f"Lexicon file missing word lists: {missing}")
+    for name in _WORD_FIELDS:
+        if not isinstance(words[name], list) or not all(isinstance(w, str) for w in words[name]):
+            raise ValueError(f"Lexicon word list {name!r} must be a list of strings")
+    emotion_base = data.get("emotion_base") or {}
+    if not isinstance(emotion_base, Mapping):
+        raise ValueError("Lexicon 'emotion_base' must be a table of scores")
+    for k, v in emotion_base.items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            raise ValueError(f"Lexicon emotion_base[{k!r}] must be a number, got {v!r}")
+    return Lexicon(
+        emotion_base={str(k): float(v) for k, v in emotion_base.items()},
+        **{name: frozenset(w.lower() for w in words[name]) for name in _WORD_FIELDS},
+    )
+
+
+def lexicon_to_dict(lex: Lexicon) -> Dict:
+    """Inverse of parse_lexicon (sorted lists, schema 1 layout)."""
+    return {
+        "schema": 1,
+        "emotion_base": dict(lex.emotion_base),
+        "words": {name: sorted(getattr(lex, name)) for name in _WORD_FIELDS},
+    }
+
+
+def _parse_source(path: Path, raw: bytes) -> Lexicon:
+    if path.suffix == ".json":
+        return parse_lexicon(json.loads(raw.decode("utf-8")))
+    if path.suffix == ".toml":
+        return parse_lexicon(tomllib.loads(raw.decode("utf-8")))
+    raise ValueError(f"Unsupported lexicon file type: {path.suffix}")
+
+
+def load_lexicon(path: Path) -> Lexicon:
+    """
+    Load a lexicon file through its compiled snapshot (<path>.snapshot).
+
+    The snapshot is normalized JSON (sorted, lowercased word lists), reused
+    while the source bytes are unchanged so a TOML source is not re-parsed;
+    otherwise the source is parsed and the snapshot rewritten atomically.
+    Snapshot contents go through the same validation as the source. Snapshot
+    writes are best-effort (e.g. read-only deployments just skip them).
+    """
+    raw = path.read_bytes()
+    source_sha = hashlib.sha256(raw).hexdigest()
+    snap_path = path.with_name(path.name + SNAPSHOT_SUFFIX)
+
+    try:
+        snap = json.loads(snap_path.read_text(encoding="utf-8"))
+        if snap.get("format") == _SNAPSHOT_FORMAT and snap.get("source_sha256") == source_sha:
+            return parse_lexicon(snap["lexicon"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        # Missing, stale format or unreadable: recompile below.
+        pass
+
+    lex = _parse_source(path, raw)
+    payload = json.dumps(
+        {"format": _SNAPSHOT_FORMAT, "source_sha256": source_sha, "lexicon": lexicon_to_dict(lex)},
+        ensure_ascii=False,
+    )
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=snap_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, snap_path)
+    except OSError:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    return lex
+
+
+class LexiconStore:
+    """
+    Holds the current Lexicon for a file and swaps in a new snapshot when the
+    file changes.
+
+    current() is lock-free: it returns whatever snapshot is installed, and at
+    most every `check_interval` seconds one caller stats the file and, if it
+    changed, loads the new snapshot and replaces the reference in one
+    assignment. Requests already holding the old Lexicon finish with it. A
+    file that fails to parse keeps the previous snapshot (see last_error).
+    """
+
+    def __init__(self, path: Path, check_interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._stamp = self._stat()
+        self._lexicon = load_lexicon(self.path)
+        self._next_check = time.monotonic() + check_interval
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def current(self) -> Lexicon:
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        return self._lexicon
+
+    def reload(self, force: bool = False) -> bool:
+        """Reload if the file changed (or if forced). Returns True if swapped."""
+        if not self._lock.acquire(blocking=False):
+            return False    # someone else is already checking
+        try:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                stamp = self._stat()
+                if stamp == self._stamp and not force:
+                    return False
+                lex = load_lexicon(self.path)
+            except (OSError, ValueError) as e:
+                self.last_error = e
+                return False
+            self._stamp = stamp
+            self.last_error = None
+            swapped = lex.version() != self._lexicon.version()
+            self._lexicon = lex
+            return swapped
+        finally:
+            self._lock.release()
+
+
+DEFAULT_STORE = LexiconStore(LEXICON_PATH)
+
+
+def current_lexicon() -> Lexicon:
+    """The live default lexicon (hot-reloaded from LEXICON_PATH)."""
+    return DEFAULT_STORE.current()
+
+
+# Import-time snapshot, kept for code that reads the vocabularies directly.
+DEFAULT_LEXICON = DEFAULT_STORE.current()
+
+EMOTION_BASE = dict(DEFAULT_LEXICON.emotion_base)
+POS_WORDS = set(DEFAULT_LEXICON.pos_words)
+NEG_WORDS = set(DEFAULT_LEXICON.neg_words)
+INTENSIFIERS = set(DEFAULT_LEXICON.intensifiers)
+DIMINISHERS = set(DEFAULT_LEXICON.diminishers)
+NEGATIONS = set(DEFAULT_LEXICON.negations)
+CONCERNING_PHRASES = set(DEFAULT_LEXICON.concerning_phrases)
+
+
+def lexicon_version() -> str:
+    """Version of the live default lexicon (part of cache keys and checkpoints)."""
+    return current_lexicon().version()
+
+
+LEXICON_VERSION = DEFAULT_LEXICON.version()
@@ -0,0 +1,163 @@
+# src/replay_eval.py
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from .analyzer import score_checkin
+from .engine import (
+    NEGATIVE_SCORE,
+    PERSISTENCE_MIN_NEGATIVE,
+    PERSISTENCE_WINDOW,
+    RISK_LEVELS,
+    decide_score,
+)
+from .cost_sensitive_eval import cost_report
+from .run_experiments import experiment_report
+
+
+def _parse_time(value: str) -> float:
+    v = (value or "").strip()
+    try:
+        return float(v)
+    except ValueError:
+        return datetime.fromisoformat(v).timestamp()
+
+
+def load_history_corpus(path: Path) -> List[Dict[str, str]]:
+    """Like run_experiments.load_corpus, plus student_id and timestamp columns."""
+    rows: List[Dict[str, str]] = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        required = {"text", "emotion_hint", "risk_label", "student_id", "timestamp"}
+        missing = required - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV missing columns: {sorted(missing)}")
+
+        for r in reader:
+            rows.append({
+                "text": (r.get("text") or "").strip(),
+                "emotion_hint": (r.get("emotion_hint") or "").strip(),
+                "risk_label": (r.get("risk_label") or "").strip().lower(),
+                "student_id": (r.get("student_id") or "").strip(),
+                "timestamp": (r.get("timestamp") or "").strip(),
+            })
+    return rows
+
+
+def persistence_flags(student_ids: List[str], timestamps: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Rule D outcome for every entry given each student's earlier check-ins.
+
+    Entries are grouped per student and ordered by time; the count of
+    negative entries in each rolling window comes from one cumulative sum
+    instead of rebuilding a recent_scores list per step. Entries with a blank
+    student_id have no history (each is its own group), so they never share
+    a window. Returns a bool array aligned with the inputs.
+    """
+    n = len(scores)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    codes: Dict[str, int] = {}
+    student = np.fromiter(
+        (codes.setdefault(s, len(codes)) if s else -1 - i for i, s in enumerate(student_ids)),
+        dtype=np.int64,
+        count=n,
+    )
+    order = np.lexsort((timestamps, student))   # by student, then time
+
+    s_student = student[order]
+    neg = (scores[order] < NEGATIVE_SCORE).astype(np.int64)
+    csum = np.concatenate(([0], np.cumsum(neg)))  # csum[i] = negatives before sorted row i
+
+    idx = np.arange(n)
+    is_start = np.empty(n, dtype=bool)
+    is_start[0] = True
+    is_start[1:] = s_student[1:] != s_student[:-1]
+    group_start = np.maximum.accumulate(np.where(is_start, idx, 0))
+    pos = idx - group_start                       # earlier entries by the same student
+
+    prior = PERSISTENCE_WINDOW - 1
+    lo = idx - np.minimum(pos, prior)
+    window_neg = csum[idx + 1] - csum[lo]         # current included
+    persistent_sorted = (pos >= prior) & (window_neg >= PERSISTENCE_MIN_NEGATIVE)
+
+    out = np.empty(n, dtype=bool)
+    out[order] = persistent_sorted
+    return out
+
+
+def replay(rows: List[Dict[str, str]], watch_threshold: float = -0.45, alert_threshold: float = -0.75) -> Dict:
+    """Hybrid (C) metrics on the same entries without and with per-student history."""
+    used = [r for r in rows if r["text"] and r["risk_label"] in RISK_LEVELS]
+    n = len(used)
+
+    scores = np.empty(n, dtype=np.float64)
+    flags = np.empty(n, dtype=np.int64)
+    for i, r in enumerate(used):
+        scores[i], flags[i] = score_checkin(r["emotion_hint"], r["text"])
+    timestamps = np.fromiter((_parse_time(r["timestamp"]) for r in used), dtype=np.float64, count=n)
+    persistent = persistence_flags([r["student_id"] for r in used], timestamps, scores)
+
+    counts: Dict[str, Dict[str, int]] = {"no_history": {}, "with_history": {}}
+    for i, r in enumerate(used):
+        yt = r["risk_label"]
+        for name, p in (("no_history", False), ("with_history", bool(persistent[i]))):
+            d = decide_score(
+                float(scores[i]),
+                int(flags[i]),
+                watch_threshold=watch_threshold,
+                alert_threshold=alert_threshold,
+                persistent=p,
+            )
+            key = f"{yt}->{RISK_LEVELS[d.risk]}"
+            counts[name][key] = counts[name].get(key, 0) + 1
+
+    return {
+        "n": n,
+        "students": len({r["student_id"] for r in used if r["student_id"]}),
+        "persistent_entries": int(persistent.sum()),
+        "results": [
+            {
+                **experiment_report(name, c),
+                "total_cost": cost_report(name, c)["total_cost"],
+            }
+            for name, c in counts.items()
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay per-student check-in histories (Rule D).")
+    parser.add_argument("corpus", type=Path, help="CSV with text, emotion_hint, risk_label, student_id, timestamp")
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    out_dir = repo_root / "results"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    report = replay(load_history_corpus(args.corpus))
+
+    out_path = out_dir / "replay_metrics.json"
+    out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"Replayed {report['n']} entries from {report['students']} students "
+          f"({report['persistent_entries']} with a persistent negative pattern)")
+    for r in report["results"]:
+        print(
+            f"- {r['name']}: acc={r['accuracy']:.3f}  macro_f1={r['macro_f1']:.3f}  "
+            f"watch_recall={r['per_class']['watch']['recall']:.3f}  total_cost={r['total_cost']:.1f}"
+        )
+
+    print(f"\nSaved: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
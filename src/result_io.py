@@ -0,0 +1,254 @@
+# src/result_io.py
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, TextIO, Tuple
+
+from .analyzer import FEATURE_NAMES, AnalysisResult
+from .engine import FLAG_BITS, FLAG_NAMES, RISK_LEVELS, AlertResult, Decision, explain
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# -------------------------
+# Records (shared with app/cli.py)
+# -------------------------
+
+def result_record(analysis: AnalysisResult, alert: AlertResult) -> Dict:
+    """One check-in result as a plain dict (the CLI / JSON Lines layout)."""
+    analyzer_flags = set(analysis.flags)
+    return {
+        "emotion": analysis.emotion,
+        "sentiment_score": analysis.sentiment_score,
+        "flags": analysis.flags,
+        "features": analysis.features,
+        "risk_level": alert.risk_level,
+        "engine_flags": [f for f in alert.flags if f not in analyzer_flags],
+        "explanation": alert.explanation,
+        "suggested_action": alert.suggested_action,
+        "lexicon_version": alert.lexicon_version,
+    }
+
+
+# -------------------------
+# JSON Lines
+# -------------------------
+
+class JsonlWriter:
+    """
+    Compact JSON Lines writer for result_record() rows.
+
+    Flags, explanations, actions and emotions come from small fixed
+    vocabularies, so their JSON encodings are computed once and reused;
+    each line is assembled from those fragments instead of going through
+    json.dumps on a fresh dict.
+    """
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._enc: Dict[str, str] = {}
+
+    def _s(self, s: str) -> str:
+        e = self._enc.get(s)
+        if e is None:
+            e = self._enc[s] = json.dumps(s, ensure_ascii=False)
+        return e
+
+    def _list(self, items: List[str]) -> str:
+        return "[" + ",".join(self._s(x) for x in items) + "]"
+
+    def write(self, analysis: AnalysisResult, alert: AlertResult, row_id: Optional[int] = None) -> None:
+        analyzer_flags = set(analysis.flags)
+        features = ",".join(f"{self._s(k)}:{v}" for k, v in analysis.features.items())
+        parts = [
+            f'"id":{row_id},' if row_id is not None else "",
+            f'"emotion":{self._s(analysis.emotion)},',
+            f'"sentiment_score":{analysis.sentiment_score!r},',
+            f'"flags":{self._list(analysis.flags)},',
+            f'"features":{{{features}}},',
+            f'"risk_level":{self._s(alert.risk_level)},',
+            f'"engine_flags":{self._list([f for f in alert.flags if f not in analyzer_flags])},',
+            f'"explanation":{self._list(alert.explanation)},',
+            f'"suggested_action":{self._s(alert.suggested_action)},',
+            f'"lexicon_version":{self._s(alert.lexicon_version)}',
+        ]
+        self._f.write("{" + "".join(parts) + "}\n")
+
+
+# -------------------------
+# Fixed-width binary records
+# -------------------------
+#
+# File layout:
+#   b"MVRB" | u32 little-endian header length H | JSON metadata, space padded
+#   so that records start at byte H | N * RECORD_SIZE record bytes
+#
+# The metadata names the flag bits, emotion codes and feature columns, so the
+# file is self-describing; records can be read with np.memmap / np.fromfile.
+# Writing only needs struct; numpy is imported by the readers, so JSON output
+# (and the CLI) work without it.
+
+MAGIC = b"MVRB"
+FORMAT_VERSION = 1
+OTHER_EMOTION = 255
+
+# numpy dtype descr of one record, packed (no padding).
+RECORD_FIELDS = [
+    ("id", "<i8"),
+    ("sentiment", "<f4"),
+    ("risk", "|u1"),         # index into RISK_LEVELS
+    ("emotion", "|u1"),      # index into metadata "emotions"; 255 = other
+    ("flags", "<u2"),        # engine.FLAG_BITS bitmask (analyzer + engine)
+    ("features", "<u2", (len(FEATURE_NAMES),)),
+]
+_RECORD = struct.Struct("<qfBBH" + "H" * len(FEATURE_NAMES))
+RECORD_SIZE = _RECORD.size
+
+
+def record_dtype() -> np.dtype:
+    import numpy as np
+
+    return np.dtype(RECORD_FIELDS)
+
+
+class BinaryResultWriter:
+    """
+    Streams fixed-width result records with buffered writes.
+
+    Explanation text is not stored: explain(Decision(risk, flags)) rebuilds
+    it. Use as a context manager, or call close() to flush the tail.
+
+    A file holds results of one lexicon version, recorded in the header:
+    `lexicon_version` if given, otherwise the first record's. Writing a
+    decision scored with another version raises ValueError; start a new
+    file after a lexicon reload. The header is written with the first
+    records (or on close).
+    """
+
+    def __init__(
+        self,
+        f: BinaryIO,
+        emotions: List[str],
+        lexicon_version: str = "",
+        buffer_records: int = 8192,
+    ) -> None:
+        if len(emotions) >= OTHER_EMOTION:
+            raise ValueError("Too many emotions for a one-byte code")
+        self._f = f
+        self._emotion_code = {e: i for i, e in enumerate(emotions)}
+        self._buf = bytearray(_RECORD.size * buffer_records)
+        self._n = 0
+        self._cap = buffer_records
+        self.count = 0
+        self._emotions = list(emotions)
+        self.lexicon_version: Optional[str] = lexicon_version or None
+        self._header_written = False
+
+    def _write_header(self) -> None:
+        meta = json.dumps({
+            "format": FORMAT_VERSION,
+            "dtype": RECORD_FIELDS,
+            "risk_levels": list(RISK_LEVELS),
+            "flags": {name: bit for name, bit in FLAG_BITS.items()},
+            "emotions": self._emotions,
+            "features": list(FEATURE_NAMES),
+            "lexicon_version": self.lexicon_version or "",
+        }).encode("utf-8")
+        header_len = len(MAGIC) + 4 + len(meta)
+        header_len += -header_len % 8
+        self._f.write(MAGIC + struct.pack("<I", header_len) + meta.ljust(header_len - len(MAGIC) - 4, b" "))
+        self._header_written = True
+
+    def write_decision(self, row_id: int, emotion: str, score: float, decision: Decision, features=()) -> None:
+        if self.lexicon_version is None:
+            self.lexicon_version = decision.lexicon_version
+        elif decision.lexicon_version != self.lexicon_version:
+            raise ValueError(
+                f"Result scored with lexicon {decision.lexicon_version!r} "
+                f"in a file for lexicon {self.lexicon_version!r}"
+            )
+        feats = list(features)[:len(FEATURE_NAMES)]
+        feats += [0] * (len(FEATURE_NAMES) - len(feats))
+        _RECORD.pack_into(
+            self._buf,
+            self._n * _RECORD.size,
+            row_id,
+            score,
+            decision.risk,
+            self._emotion_code.get(emotion, OTHER_EMOTION),
+            decision.flags,
+            *(min(int(v), 0xFFFF) for v in feats),
+        )
+        self._n += 1
+        self.count += 1
+        if self._n == self._cap:
+            self.flush()
+
+    def write(self, row_id: int, analysis: AnalysisResult, alert: AlertResult) -> None:
+        flags = 0
+        for f in alert.flags:
+            flags |= FLAG_BITS.get(f, 0)
+        self.write_decision(
+            row_id,
+            analysis.emotion,
+            analysis.sentiment_score,
+            Decision(RISK_LEVELS.index(alert.risk_level), flags, alert.lexicon_version),
+            [analysis.features.get(k, 0) for k in FEATURE_NAMES],
+        )
+
+    def flush(self) -> None:
+        if self._n:
+            if not self._header_written:
+                self._write_header()
+            self._f.write(memoryview(self._buf)[: self._n * _RECORD.size])
+            self._n = 0
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._header_written:
+            self._write_header()
+        self.flush()
+
+    def __enter__(self) -> "BinaryResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_header(path: Path) -> Tuple[Dict, int]:
+    with Path(path).open("rb") as f:
+        head = f.read(8)
+        if head[:4] != MAGIC:
+            raise ValueError(f"Not a mini-vibes result file: {path}")
+        (header_len,) = struct.unpack("<I", head[4:8])
+        meta = json.loads(f.read(header_len - 8).decode("utf-8"))
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result file format: {meta.get('format')!r}")
+    return meta, header_len
+
+
+def read_results(path: Path, mmap: bool = True) -> Tuple[Dict, np.ndarray]:
+    """(metadata, structured array of record_dtype()) — memory-mapped by default."""
+    import numpy as np
+
+    dtype = record_dtype()
+    meta, offset = read_header(path)
+    if mmap:
+        n = (Path(path).stat().st_size - offset) // dtype.itemsize
+        if n == 0:
+            return meta, np.zeros(0, dtype=dtype)
+        return meta, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n,))
+    return meta, np.fromfile(path, dtype=dtype, offset=offset)
+
+
+def explain_record(record) -> AlertResult:
+    """Full AlertResult (explanations, action) for one binary record."""
+    return explain(Decision(int(record["risk"]), int(record["flags"])))
+
+
+def flag_names(flags: int) -> List[str]:
+    return sorted(name for bit, name in FLAG_NAMES.items() if flags & bit)
@@ -5,12 +5,9 @@ import csv
 import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
-import matplotlib.pyplot as plt
-
-from .analyzer import analyze_checkin
-from .engine import assess_risk
+from .engine import RISK_LEVELS, decide_checkin
 
 
 LABELS = ["safe", "watch", "alert"]
@@ -18,21 +15,25 @@ ALLOWED = set(LABELS)
 
 
 def load_corpus(path: Path) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
     with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        required = {"text", "emotion_hint", "risk_label", "reason_tag"}
-        missing = required - set(reader.fieldnames or [])
-        if missing:
-            raise ValueError(f"CSV missing columns: {sorted(missing)}")
-
-        for r in reader:
-            rows.append({
-                "text": (r.get("text") or "").strip(),
-                "emotion_hint": (r.get("emotion_hint") or "").strip(),
-                "risk_label": (r.get("risk_label") or "").strip().lower(),
-                "reason_tag": (r.get("reason_tag") or "").strip(),
-            })
+        return parse_corpus(f)
+
+
+def parse_corpus(f: Iterable[str]) -> List[Dict[str, str]]:
+    rows: List[Dict[str, str]] = []
+    reader = csv.DictReader(f)
+    required = {"text", "emotion_hint", "risk_label", "reason_tag"}
+    missing = required - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"CSV missing columns: {sorted(missing)}")
+
+    for r in reader:
+        rows.append({
+            "text": (r.get("text") or "").strip(),
+            "emotion_hint": (r.get("emotion_hint") or "").strip(),
+            "risk_label": (r.get("risk_label") or "").strip().lower(),
+            "reason_tag": (r.get("reason_tag") or "").strip(),
+        })
     return rows
 
 
@@ -43,6 +44,15 @@ def cm_counts(y_true: List[str], y_pred: List[str]) -> Dict[Tuple[str, str], int
     return cm
 
 
+def cm_from_counts(counts: Dict[str, int]) -> Dict[Tuple[str, str], int]:
+    """{"true->pred": n} (as stored by incremental / shadow / replay eval) -> cm_counts layout."""
+    out: Dict[Tuple[str, str], int] = {}
+    for key, n in counts.items():
+        t, p = key.split("->")
+        out[(t, p)] = n
+    return out
+
+
 def cm_matrix(cm: Dict[Tuple[str, str], int]) -> List[List[int]]:
     return [[cm.get((r, c), 0) for c in LABELS] for r in LABELS]
 
@@ -96,18 +106,14 @@ def predict_text_lexicon_only(text: str, emotion_hint: str) -> str:
     Baseline B: ignore selected emotion, analyze text only.
     We feed empty emotion into analyzer to reduce dependence on emotion base.
     """
-    a = analyze_checkin("", text)
-    r = assess_risk(a, recent_scores=[])
-    return r.risk_level
+    return RISK_LEVELS[decide_checkin("", text).risk]
 
 
 def predict_hybrid(text: str, emotion_hint: str) -> str:
     """
     Baseline C: emotion + text + explainable rules (your main system).
     """
-    a = analyze_checkin(emotion_hint, text)
-    r = assess_risk(a, recent_scores=[])
-    return r.risk_level
+    return RISK_LEVELS[decide_checkin(emotion_hint, text).risk]
 
 
 def run_experiment(name: str, rows: List[Dict[str, str]]) -> Dict:
@@ -153,11 +159,32 @@ def run_experiment(name: str, rows: List[Dict[str, str]]) -> Dict:
     }
 
 
+def experiment_report(name: str, counts: Dict[str, int]) -> Dict:
+    """Same fields as run_experiment, rebuilt from {"true->pred": n} counts."""
+    cm = cm_from_counts(counts)
+    mat = cm_matrix(cm)
+    prf = prf_from_cm(mat)
+    n = sum(cm.values())
+    correct = sum(cm.get((c, c), 0) for c in LABELS)
+    return {
+        "name": name,
+        "n": n,
+        "accuracy": safe_div(correct, n),
+        "macro_f1": macro_f1(prf),
+        "per_class": prf,
+        "confusion_matrix": {"labels": LABELS, "matrix": mat},
+    }
+
+
 # -------------------------
 # Plotting (Hybrid only, for now)
 # -------------------------
+# matplotlib is imported by the plotting functions only, so the evaluation
+# helpers above can be used without it.
 
 def plot_confusion_matrix(mat: List[List[int]], out_path: Path, title: str) -> None:
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     im = ax.imshow(mat)
     ax.set_xticks(range(len(LABELS)))
@@ -187,6 +214,8 @@ def plot_prf(per_class: Dict[str, Dict[str, float]], out_path: Path, title: str)
     x = list(range(len(classes)))
     width = 0.25
 
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     for k, m in enumerate(metrics):
         vals = [per_class[c][m] for c in classes]
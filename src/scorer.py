@@ -0,0 +1,174 @@
+# src/scorer.py
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+from .analyzer import ANALYZER_FLAG_BITS, DEFAULT_SCORER, AnalysisResult, ScorerConfig, analyze_checkin, score_checkin
+from .engine import PERSISTENCE_WINDOW, AlertResult, Decision, decide_score, explain
+from .lexicon import Lexicon, current_lexicon
+
+
+_SHARDS = 16
+
+
+class _Shard:
+    # One stripe of per-scorer mutable state. Each stripe has its own lock,
+    # so threads working on different students / texts rarely contend.
+    __slots__ = ("lock", "data")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.data: "OrderedDict" = OrderedDict()
+
+
+class Scorer:
+    """
+    Check-in scorer that is safe to call concurrently from many threads.
+
+    A Scorer owns everything a decision depends on: an immutable Lexicon
+    snapshot, a frozen ScorerConfig and the thresholds. These are never
+    mutated, so plain scoring touches no locks at all. Optional state is
+    striped across per-instance shards, each with its own lock:
+      - cache_size > 0: LRU of (sentiment score, analyzer flag bits) keyed by
+        normalized (emotion, text); valid for the scorer's lifetime since the
+        lexicon and config cannot change under it; holds at most cache_size
+        entries in total (split across min(cache_size, 16) shards)
+      - history=True: each student's last PERSISTENCE_WINDOW - 1 scores for
+        Rule D, updated when a student_id is passed
+
+    To pick up a reloaded lexicon, build a new scorer with with_lexicon() and
+    swap the reference; calls already running finish on the old snapshot.
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Lexicon] = None,
+        config: Optional[ScorerConfig] = None,
+        watch_threshold: float = -0.45,
+        alert_threshold: float = -0.75,
+        cache_size: int = 0,
+        history: bool = False,
+    ) -> None:
+        if cache_size < 0:
+            raise ValueError("cache_size must be >= 0")
+        self.lexicon = lexicon or current_lexicon()
+        self.config = config or DEFAULT_SCORER
+        self.watch_threshold = watch_threshold
+        self.alert_threshold = alert_threshold
+        self.cache_size = cache_size
+        self.lexicon_version = self.lexicon.version()
+        n_cache = min(_SHARDS, cache_size)
+        self._cache: Tuple[_Shard, ...] = tuple(_Shard() for _ in range(n_cache))
+        # Per-shard capacities summing to exactly cache_size.
+        self._cache_caps = tuple(cache_size // n_cache + (i < cache_size % n_cache) for i in range(n_cache))
+        self._history: Tuple[_Shard, ...] = tuple(_Shard() for _ in range(_SHARDS)) if history else ()
+
+    def with_lexicon(self, lexicon: Lexicon) -> "Scorer":
+        """Same settings on another lexicon; history carries over, the cache does not."""
+        s = Scorer(
+            lexicon,
+            self.config,
+            self.watch_threshold,
+            self.alert_threshold,
+            cache_size=self.cache_size,
+        )
+        s._history = self._history
+        return s
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+
+    def score(self, emotion: str, text: str) -> Tuple[float, int]:
+        """(sentiment_score, analyzer flag bits), served from the cache if enabled."""
+        if not self._cache:
+            return score_checkin(emotion, text, self.lexicon, self.config)
+
+        key = ((emotion or "").strip().lower(), (text or "").strip())
+        slot = hash(key) % len(self._cache)
+        shard = self._cache[slot]
+        with shard.lock:
+            hit = shard.data.get(key)
+            if hit is not None:
+                shard.data.move_to_end(key)
+                return hit
+
+        value = score_checkin(emotion, text, self.lexicon, self.config)
+        with shard.lock:
+            shard.data[key] = value
+            if len(shard.data) > self._cache_caps[slot]:
+                shard.data.popitem(last=False)
+        return value
+
+    def decide(
+        self,
+        emotion: str,
+        text: str,
+        student_id: Optional[str] = None,
+        recent_scores: Optional[List[float]] = None,
+    ) -> Decision:
+        """
+        Risk code and flag bits for one check-in. With history enabled and a
+        student_id, Rule D uses (and then extends) that student's history;
+        otherwise explicit recent_scores are used as in decide_checkin.
+        """
+        score, flags = self.score(emotion, text)
+        return self._decide(score, flags, student_id, recent_scores)
+
+    def checkin(
+        self,
+        emotion: str,
+        text: str,
+        student_id: Optional[str] = None,
+        recent_scores: Optional[List[float]] = None,
+    ) -> Tuple[AnalysisResult, AlertResult]:
+        """Full AnalysisResult + AlertResult (fresh objects on every call)."""
+        analysis = analyze_checkin(emotion, text, self.lexicon, self.config)
+        flags = 0
+        for f in analysis.flags:
+            flags |= ANALYZER_FLAG_BITS[f]
+        decision = self._decide(analysis.sentiment_score, flags, student_id, recent_scores)
+        return analysis, explain(decision)
+
+    def _decide(self, score: float, flags: int, student_id: Optional[str], recent_scores: Optional[List[float]]) -> Decision:
+        if not self._history or student_id is None:
+            return decide_score(
+                score,
+                flags,
+                recent_scores,
+                self.watch_threshold,
+                self.alert_threshold,
+                lexicon_version=self.lexicon_version,
+            )
+
+        shard = self._history[hash(student_id) % _SHARDS]
+        with shard.lock:
+            past: Optional[Deque[float]] = shard.data.get(student_id)
+            if past is None:
+                past = shard.data[student_id] = deque(maxlen=PERSISTENCE_WINDOW - 1)
+            recent = list(past)
+            past.append(score)
+        return decide_score(
+            score,
+            flags,
+            recent,
+            self.watch_threshold,
+            self.alert_threshold,
+            lexicon_version=self.lexicon_version,
+        )
+
+    def history(self, student_id: str) -> List[float]:
+        if not self._history:
+            return []
+        shard = self._history[hash(student_id) % _SHARDS]
+        with shard.lock:
+            return list(shard.data.get(student_id, ()))
+
+    def cache_len(self) -> int:
+        total = 0
+        for shard in self._cache:
+            with shard.lock:
+                total += len(shard.data)
+        return total
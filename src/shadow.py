@@ -0,0 +1,242 @@
+# src/shadow.py
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .analyzer import DEFAULT_SCORER, ScorerConfig, scan, score_tokens
+from .cost_sensitive_eval import cost_report
+from .engine import RISK_LEVELS, Decision, decide_score, disabled_rules_mask
+from .lexicon import DEFAULT_LEXICON, Lexicon, current_lexicon
+from .run_experiments import LABELS, experiment_report, load_corpus
+
+
+@dataclass(frozen=True)
+class ShadowConfig:
+    name: str
+    lexicon: Lexicon = DEFAULT_LEXICON
+    scorer: ScorerConfig = DEFAULT_SCORER
+    watch_threshold: float = -0.45
+    alert_threshold: float = -0.75
+    disabled_rules: FrozenSet[str] = frozenset()   # rule letters, e.g. {"D"}
+
+    @property
+    def disabled_mask(self) -> int:
+        return disabled_rules_mask(self.disabled_rules)
+
+
+def config_from_dict(d: Dict) -> ShadowConfig:
+    """
+    Build a ShadowConfig from JSON, e.g.:
+      {"name": "neg_plus", "watch_threshold": -0.4, "disabled_rules": ["D"],
+       "lexicon": {"add": {"neg_words": ["drained"]}, "remove": {}, "emotion_base": {"tired": -0.3}},
+       "scorer": {"negation_window": 3}}
+    Lexicon changes are applied on top of the live default lexicon; "scorer" holds
+    ScorerConfig fields.
+    """
+    lex = d.get("lexicon") or {}
+    base = current_lexicon()
+    return ShadowConfig(
+        name=d["name"],
+        lexicon=base.adjusted(
+            add=lex.get("add"),
+            remove=lex.get("remove"),
+            emotion_base=lex.get("emotion_base"),
+        ) if lex else base,
+        scorer=ScorerConfig(**d["scorer"]) if d.get("scorer") else DEFAULT_SCORER,
+        watch_threshold=float(d.get("watch_threshold", -0.45)),
+        alert_threshold=float(d.get("alert_threshold", -0.75)),
+        disabled_rules=frozenset(d.get("disabled_rules", ())),
+    )
+
+
+class _Plan:
+    """
+    Shared work for a fixed set of configs: every entry is scanned once,
+    configs with the same lexicon and scorer settings share one analyzer
+    pass, and only the (cheap) rule engine runs per config.
+    """
+
+    def __init__(self, configs: List[ShadowConfig]) -> None:
+        names = [c.name for c in configs]
+        if len(set(names)) != len(names):
+            raise ValueError("Shadow config names must be unique")
+        self.configs = configs
+        self.scorers: List[Tuple[Lexicon, ScorerConfig]] = []
+        self.scorer_of: List[int] = []
+        seen: Dict[Tuple[str, ScorerConfig], int] = {}
+        for c in configs:
+            v = (c.lexicon.version(), c.scorer)
+            if v not in seen:
+                seen[v] = len(self.scorers)
+                self.scorers.append((c.lexicon, c.scorer))
+            self.scorer_of.append(seen[v])
+        self.masks = [c.disabled_mask for c in configs]
+
+    def decide(self, emotion: str, text: str, recent_scores: Optional[List[float]] = None) -> List[Decision]:
+        tokens = scan(text or "")
+        lowered = (text or "").strip().lower()
+        scored = [score_tokens(emotion, tokens, lowered, lex, cfg) for lex, cfg in self.scorers]
+        out: List[Decision] = []
+        for c, li, mask in zip(self.configs, self.scorer_of, self.masks):
+            score, flags = scored[li]
+            out.append(decide_score(
+                score,
+                flags,
+                recent_scores,
+                watch_threshold=c.watch_threshold,
+                alert_threshold=c.alert_threshold,
+                disabled_rules=mask,
+                lexicon_version=c.lexicon.version(),
+            ))
+        return out
+
+
+def shadow_evaluate(
+    rows: List[Dict[str, str]],
+    configs: List[ShadowConfig],
+    max_examples: int = 50,
+) -> Dict:
+    """
+    Evaluate N configurations over one pass of the corpus.
+
+    Returns per-config metrics (same fields as run_experiments / cost eval)
+    and a disagreement report: pairwise disagreement counts plus up to
+    `max_examples` rows where the configs did not all agree.
+    """
+    plan = _Plan(configs)
+    names = [c.name for c in configs]
+    counts: List[Dict[str, int]] = [{} for _ in configs]
+    pairwise: Dict[Tuple[int, int], int] = {}
+    examples: List[Dict] = []
+    n_disagree = 0
+
+    for row_id, r in enumerate(rows):
+        text = r["text"]
+        yt = r["risk_label"]
+        if yt not in LABELS or not text:
+            continue
+
+        preds = [RISK_LEVELS[d.risk] for d in plan.decide(r["emotion_hint"], text)]
+        for k, yp in enumerate(preds):
+            key = f"{yt}->{yp}"
+            counts[k][key] = counts[k].get(key, 0) + 1
+
+        if len(set(preds)) > 1:
+            n_disagree += 1
+            for i in range(len(preds)):
+                for j in range(i + 1, len(preds)):
+                    if preds[i] != preds[j]:
+                        pairwise[(i, j)] = pairwise.get((i, j), 0) + 1
+            if len(examples) < max_examples:
+                examples.append({
+                    "row": row_id,
+                    "text": text,
+                    "emotion_hint": r["emotion_hint"],
+                    "true": yt,
+                    "pred": dict(zip(names, preds)),
+                })
+
+    return {
+        "configs": [
+            {
+                **experiment_report(c.name, counts[k]),
+                "total_cost": cost_report(c.name, counts[k])["total_cost"],
+                "lexicon_version": c.lexicon.version(),
+                "scorer": c.scorer.version(),
+                "watch_threshold": c.watch_threshold,
+                "alert_threshold": c.alert_threshold,
+                "disabled_rules": sorted(c.disabled_rules),
+            }
+            for k, c in enumerate(configs)
+        ],
+        "disagreement": {
+            "rows": n_disagree,
+            "pairwise": {f"{names[i]}|{names[j]}": n for (i, j), n in sorted(pairwise.items())},
+            "examples": examples,
+        },
+    }
+
+
+class ShadowScorer:
+    """
+    Live shadow scoring: serve the primary config's decision and score the
+    candidates on the same tokens, tallying (primary -> candidate) risk
+    transitions per candidate for later review.
+
+    Safe to share between threads: scoring is lock-free and only the tally
+    update takes the instance lock.
+    """
+
+    def __init__(self, primary: ShadowConfig, candidates: List[ShadowConfig]) -> None:
+        self._plan = _Plan([primary] + list(candidates))
+        self.disagreements: Dict[str, Dict[str, int]] = {c.name: {} for c in candidates}
+        self.n = 0
+        self._lock = threading.Lock()
+
+    def decide(self, emotion: str, text: str, recent_scores: Optional[List[float]] = None) -> Decision:
+        """
+        Primary decision for one check-in. recent_scores (the student's
+        previous scores, as in decide_checkin) feed Rule D for every config.
+        """
+        decisions = self._plan.decide(emotion, text, recent_scores)
+        primary = decisions[0]
+        changed = [
+            (c.name, f"{RISK_LEVELS[primary.risk]}->{RISK_LEVELS[d.risk]}")
+            for c, d in zip(self._plan.configs[1:], decisions[1:])
+            if d.risk != primary.risk
+        ]
+        with self._lock:
+            self.n += 1
+            for name, key in changed:
+                tally = self.disagreements[name]
+                tally[key] = tally.get(key, 0) + 1
+        return primary
+
+
+DEMO_CONFIGS = [
+    {"name": "baseline"},
+    {"name": "watch_-0.35", "watch_threshold": -0.35},
+    {"name": "no_rule_C", "disabled_rules": ["C"]},
+    {"name": "neg_plus", "lexicon": {"add": {"neg_words": ["nervous", "boring", "heavy"]}}},
+    {"name": "negation_window_4", "scorer": {"negation_window": 4}},
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate several configurations in one pass.")
+    parser.add_argument("configs", nargs="?", type=Path, help="JSON list of configs (default: demo set)")
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    corpus_path = repo_root / "data" / "youth_corpus.csv"
+    out_dir = repo_root / "results"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    raw = json.loads(args.configs.read_text(encoding="utf-8")) if args.configs else DEMO_CONFIGS
+    configs = [config_from_dict(d) for d in raw]
+
+    report = shadow_evaluate(load_corpus(corpus_path), configs)
+
+    out_path = out_dir / "shadow_eval.json"
+    out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("Shadow evaluation:")
+    for r in report["configs"]:
+        print(
+            f"- {r['name']}: n={r['n']}  acc={r['accuracy']:.3f}  macro_f1={r['macro_f1']:.3f}  "
+            f"total_cost={r['total_cost']:.1f}"
+        )
+    print(f"Rows with disagreement: {report['disagreement']['rows']}")
+    for pair, n in report["disagreement"]["pairwise"].items():
+        print(f"  {pair}: {n}")
+
+    print(f"\nSaved: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# src/sketches.py
+from __future__ import annotations
+
+import hashlib
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .analyzer import AnalysisResult, tokenize
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash64(item: str, seed: int = 0) -> int:
+    h = hashlib.blake2b(item.encode("utf-8"), digest_size=8, key=seed.to_bytes(8, "little"))
+    return int.from_bytes(h.digest(), "little")
+
+
+class CountMinSketch:
+    """
+    Approximate counts in width * depth counters. Estimates never undercount;
+    overcount is at most ~ e/width * total with probability 1 - e^-depth.
+    Sketches with the same shape and seed merge by adding tables.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, seed: int = 0) -> None:
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self._table = array("q", [0]) * (width * depth)
+
+    def _cells(self, item: str) -> List[int]:
+        # Double hashing: row i uses h1 + i * h2.
+        h = _hash64(item, self.seed)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        w = self.width
+        return [i * w + (h1 + i * h2) % w for i in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> None:
+        t = self._table
+        for c in self._cells(item):
+            t[c] += count
+        self.total += count
+
+    def estimate(self, item: str) -> int:
+        t = self._table
+        return min(t[c] for c in self._cells(item))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Can only merge count-min sketches with the same width, depth and seed")
+        t, o = self._table, other._table
+        for i in range(len(t)):
+            t[i] += o[i]
+        self.total += other.total
+
+
+class HeavyHitters:
+    """
+    Misra-Gries summary keeping at most `capacity` counters. Any item with
+    true frequency > total / (capacity + 1) is guaranteed to be kept; kept
+    counts undercount by at most that much. Summaries merge exactly.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+
+    def add(self, item: str, count: int = 1) -> None:
+        self._counts[item] = self._counts.get(item, 0) + count
+        self.total += count
+        if len(self._counts) > self.capacity:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        # Subtract the (capacity+1)-th largest count from everyone.
+        cut = sorted(self._counts.values(), reverse=True)[self.capacity]
+        self._counts = {k: v - cut for k, v in self._counts.items() if v > cut}
+
+    def merge(self, other: "HeavyHitters") -> None:
+        for k, v in other._counts.items():
+            self._counts[k] = self._counts.get(k, 0) + v
+        self.total += other.total
+        if len(self._counts) > self.capacity:
+            self._shrink()
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        return sorted(self._counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2**p one-byte registers (~1.04 / sqrt(2**p) error)."""
+
+    def __init__(self, p: int = 12) -> None:
+        if not 4 <= p <= 16:
+            raise ValueError("p must be in [4, 16]")
+        self.p = p
+        self.m = 1 << p
+        self._reg = bytearray(self.m)
+
+    def add(self, item: str) -> None:
+        h = _hash64(item)
+        idx = h >> (64 - self.p)
+        rest = (h << self.p) & _MASK64
+        rank = 64 - rest.bit_length() + 1 if rest else (64 - self.p) + 1
+        if rank > self._reg[idx]:
+            self._reg[idx] = rank
+
+    def count(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / sum(2.0 ** -r for r in self._reg)
+        zeros = self._reg.count(0)
+        if est <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)   # small-range (linear counting) correction
+        return est
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if self.p != other.p:
+            raise ValueError("Can only merge HyperLogLogs with the same precision")
+        self._reg = bytearray(max(a, b) for a, b in zip(self._reg, other._reg))
+
+
+class TrendSketch:
+    """
+    Population-level early-warning signals for one scope (e.g. a school and
+    week), without storing entries:
+      - count-min word frequencies and Misra-Gries heavy hitters over tokens
+      - per-flag HyperLogLog of distinct students
+      - per-student EWMA of sentiment
+
+    Memory is fixed by the sketch sizes (plus one float per student for the
+    EWMA) regardless of volume. Sketches with the same settings merge, so
+    per-worker or per-day sketches can be rolled up.
+    """
+
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 4,
+        heavy_hitters: int = 64,
+        hll_p: int = 12,
+        ewma_alpha: float = 0.3,
+    ) -> None:
+        self.words = CountMinSketch(width, depth)
+        self.top_words = HeavyHitters(heavy_hitters)
+        self.hll_p = hll_p
+        self.flag_students: Dict[str, HyperLogLog] = {}
+        self.flag_counts: Dict[str, int] = {}
+        self.ewma_alpha = ewma_alpha
+        # student_id -> (ewma, timestamp of last update)
+        self.student_ewma: Dict[str, Tuple[float, float]] = {}
+        self.n = 0
+
+    def observe(
+        self,
+        student_id: str,
+        tokens: Iterable[str],
+        flags: Iterable[str],
+        sentiment_score: float,
+        timestamp: float = 0.0,
+    ) -> None:
+        self.n += 1
+        for w in tokens:
+            self.words.add(w)
+            self.top_words.add(w)
+
+        for f in flags:
+            self.flag_counts[f] = self.flag_counts.get(f, 0) + 1
+            hll = self.flag_students.get(f)
+            if hll is None:
+                hll = self.flag_students[f] = HyperLogLog(self.hll_p)
+            hll.add(student_id)
+
+        prev = self.student_ewma.get(student_id)
+        if prev is None:
+            self.student_ewma[student_id] = (sentiment_score, timestamp)
+        else:
+            a = self.ewma_alpha
+            self.student_ewma[student_id] = (a * sentiment_score + (1 - a) * prev[0], max(timestamp, prev[1]))
+
+    def observe_analysis(self, student_id: str, text: str, analysis: AnalysisResult, timestamp: float = 0.0) -> None:
+        self.observe(student_id, tokenize(text or ""), analysis.flags, analysis.sentiment_score, timestamp)
+
+    def word_count(self, word: str) -> int:
+        return self.words.estimate(word.lower())
+
+    def distinct_students(self, flag: str) -> float:
+        hll = self.flag_students.get(flag)
+        return hll.count() if hll is not None else 0.0
+
+    def ewma(self, student_id: str) -> Optional[float]:
+        v = self.student_ewma.get(student_id)
+        return v[0] if v is not None else None
+
+    def settings(self) -> Tuple:
+        """(width, depth, seed, heavy_hitters, hll_p, ewma_alpha)"""
+        w = self.words
+        return (w.width, w.depth, w.seed, self.top_words.capacity, self.hll_p, self.ewma_alpha)
+
+    def merge(self, other: "TrendSketch") -> None:
+        """
+        Fold another sketch into this one. Per-student EWMAs are not additive:
+        when both sides saw a student, the more recently updated value wins
+        (workers are expected to be sharded by student or by time).
+
+        Raises ValueError, leaving this sketch untouched, unless both sketches
+        have the same settings().
+        """
+        if self.settings() != other.settings():
+            raise ValueError(
+                f"Can only merge trend sketches with the same settings: {self.settings()} != {other.settings()}"
+            )
+        self.words.merge(other.words)
+        self.top_words.merge(other.top_words)
+        for f, hll in other.flag_students.items():
+            mine = self.flag_students.get(f)
+            if mine is None:
+                mine = self.flag_students[f] = HyperLogLog(self.hll_p)
+            mine.merge(hll)
+        for f, c in other.flag_counts.items():
+            self.flag_counts[f] = self.flag_counts.get(f, 0) + c
+        for sid, v in other.student_ewma.items():
+            mine_v = self.student_ewma.get(sid)
+            if mine_v is None or v[1] >= mine_v[1]:
+                self.student_ewma[sid] = v
+        self.n += other.n
@@ -6,8 +6,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 
 from .run_experiments import load_corpus, LABELS
-from .analyzer import analyze_checkin
-from .engine import assess_risk
+from .analyzer import score_checkin
+from .engine import RISK_LEVELS, decide_score
 
 COSTS: Dict[Tuple[str, str], float] = {
     ("alert", "safe"): 10.0,
@@ -18,6 +18,9 @@ COSTS: Dict[Tuple[str, str], float] = {
     ("watch", "alert"): 2.0,
 }
 
+# Sweep from more aggressive (higher threshold) to more conservative (lower threshold)
+THRESHOLDS = [-0.20, -0.30, -0.35, -0.40, -0.45, -0.50, -0.55, -0.60]
+
 def cost_of(y_true: str, y_pred: str) -> float:
     if y_true == y_pred:
         return 0.0
@@ -39,28 +42,30 @@ def recall_for(label: str, cm: Dict[Tuple[str, str], int]) -> float:
     return safe_div(tp, tp + fn)
 
 def sweep(rows: List[Dict[str, str]], thresholds: List[float], alert_threshold: float = -0.75) -> List[Dict]:
+    # The analyzer does not depend on thresholds: score each row once and
+    # only re-run the (cheap) rule engine per threshold.
+    scored: List[Tuple[str, float, int]] = []
+    for r in rows:
+        text = r["text"]
+        yt = r["risk_label"]
+        if yt not in LABELS or not text:
+            continue
+        score, flags = score_checkin(r["emotion_hint"], text)
+        scored.append((yt, score, flags))
+
     out: List[Dict] = []
     for thr in thresholds:
         y_true: List[str] = []
         y_pred: List[str] = []
         costs: List[float] = []
 
-        for r in rows:
-            text = r["text"]
-            emo = r["emotion_hint"]
-            yt = r["risk_label"]
-
-            if yt not in LABELS or not text:
-                continue
-
-            analysis = analyze_checkin(emo, text)
-            alert = assess_risk(
-                analysis,
-                recent_scores=[],
+        for yt, score, flags in scored:
+            yp = RISK_LEVELS[decide_score(
+                score,
+                flags,
                 watch_threshold=thr,
                 alert_threshold=alert_threshold,
-            )
-            yp = alert.risk_level
+            ).risk]
 
             y_true.append(yt)
             y_pred.append(yp)
@@ -89,10 +94,7 @@ def main() -> None:
 
     rows = load_corpus(corpus_path)
 
-    # Sweep from more aggressive (higher threshold) to more conservative (lower threshold)
-    thresholds = [-0.20, -0.30, -0.35, -0.40, -0.45, -0.50, -0.55, -0.60]
-
-    results = sweep(rows, thresholds, alert_threshold=-0.75)
+    results = sweep(rows, THRESHOLDS, alert_threshold=-0.75)
 
     # Save for plotting / reporting
     out_path = out_dir / "threshold_sweep.json"
@@ -0,0 +1,172 @@
+# src/triage.py
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .engine import AlertResult, RISK_LEVELS
+
+
+_RISK_RANK = {r: i for i, r in enumerate(RISK_LEVELS)}
+
+
+@dataclass
+class TriageItem:
+    student_id: str
+    risk_level: str
+    sentiment_score: float
+    flags: List[str]
+    waiting_since: float      # timestamp of the oldest unacknowledged check-in
+    updated_at: float         # timestamp of the latest check-in
+
+    def severity_key(self) -> Tuple:
+        """
+        Smaller sorts first (min-heap). Order of precedence:
+          1) risk level (alert > watch > safe)
+          2) needs_human_review
+          3) sentiment score (more negative first)
+          4) persistent_negative_pattern
+          5) age (waiting longest first)
+        """
+        return (
+            -_RISK_RANK.get(self.risk_level, 0),
+            "needs_human_review" not in self.flags,
+            self.sentiment_score,
+            "persistent_negative_pattern" not in self.flags,
+            self.waiting_since,
+        )
+
+
+class TriageQueue:
+    """
+    Counselor triage queue: one entry per student, most severe first.
+
+    Backed by an indexed binary heap (student_id -> heap slot), so push,
+    re-prioritization on a new check-in, pop and acknowledge are all
+    O(log n); top(k) is O(k log k) and does not modify the queue.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[Tuple, TriageItem]] = []
+        self._pos: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._pos
+
+    def get(self, student_id: str) -> Optional[TriageItem]:
+        i = self._pos.get(student_id)
+        return self._heap[i][1] if i is not None else None
+
+    def push(self, student_id: str, alert: AlertResult, sentiment_score: float, timestamp: float) -> TriageItem:
+        """
+        Add a student's assessed check-in, or re-prioritize them if they are
+        already queued. Until acknowledged, a queued student keeps the most
+        severe pending state: the highest risk level, the lowest sentiment
+        score, every flag seen so far (e.g. needs_human_review) and the
+        original waiting time. A later benign check-in never lowers priority.
+        """
+        i = self._pos.get(student_id)
+        risk_level = alert.risk_level
+        flags = set(alert.flags)
+        waiting_since = timestamp
+        if i is not None:
+            prev = self._heap[i][1]
+            if _RISK_RANK.get(prev.risk_level, 0) > _RISK_RANK.get(risk_level, 0):
+                risk_level = prev.risk_level
+            sentiment_score = min(sentiment_score, prev.sentiment_score)
+            flags.update(prev.flags)
+            waiting_since = min(timestamp, prev.waiting_since)
+        item = TriageItem(
+            student_id=student_id,
+            risk_level=risk_level,
+            sentiment_score=sentiment_score,
+            flags=sorted(flags),
+            waiting_since=waiting_since,
+            updated_at=timestamp,
+        )
+        entry = (item.severity_key(), item)
+
+        if i is None:
+            self._heap.append(entry)
+            self._pos[student_id] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+        else:
+            self._heap[i] = entry
+            self._sift_up(i)
+            self._sift_down(self._pos[student_id])
+        return item
+
+    def peek(self) -> Optional[TriageItem]:
+        return self._heap[0][1] if self._heap else None
+
+    def pop(self) -> TriageItem:
+        if not self._heap:
+            raise IndexError("pop from empty triage queue")
+        return self._remove_at(0)
+
+    def acknowledge(self, student_id: str) -> Optional[TriageItem]:
+        """Remove a student's entry once a counselor has handled it."""
+        i = self._pos.get(student_id)
+        return self._remove_at(i) if i is not None else None
+
+    def top(self, k: int) -> List[TriageItem]:
+        """The k most severe items, in order, without removing them."""
+        out: List[TriageItem] = []
+        if k <= 0 or not self._heap:
+            return out
+        frontier = [(self._heap[0][0], 0)]
+        while frontier and len(out) < k:
+            _, i = heapq.heappop(frontier)
+            out.append(self._heap[i][1])
+            for c in (2 * i + 1, 2 * i + 2):
+                if c < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[c][0], c))
+        return out
+
+    # -------------------------
+    # Heap internals
+    # -------------------------
+
+    def _remove_at(self, i: int) -> TriageItem:
+        item = self._heap[i][1]
+        last = self._heap.pop()
+        del self._pos[item.student_id]
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1].student_id] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1].student_id])
+        return item
+
+    def _swap(self, i: int, j: int) -> None:
+        h = self._heap
+        h[i], h[j] = h[j], h[i]
+        self._pos[h[i][1].student_id] = i
+        self._pos[h[j][1].student_id] = j
+
+    def _sift_up(self, i: int) -> None:
+        h = self._heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if h[i][0] < h[parent][0]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    def _sift_down(self, i: int) -> None:
+        h = self._heap
+        n = len(h)
+        while True:
+            smallest = i
+            for c in (2 * i + 1, 2 * i + 2):
+                if c < n and h[c][0] < h[smallest][0]:
+                    smallest = c
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+from src.aggregate import RollupStore
+from src.analyzer import analyze_checkin
+from src.engine import assess_risk
+
+def _add(store, emo, text, when, classroom):
+    a = analyze_checkin(emo, text)
+    store.add(a, assess_risk(a), when, school="north", grade="7", classroom=classroom)
+
+def test_rollups_per_level_and_window():
+    store = RollupStore()
+    _add(store, "okay", "Sometimes I can't do this anymore.", date(2024, 3, 4), "7a")
+    _add(store, "happy", "Today was great.", date(2024, 3, 6), "7b")
+
+    week = store.query("school", date(2024, 3, 6), "week", school="north")
+    assert week.n == 2
+    assert week.risk_counts["alert"] == 1
+    assert week.flag_counts["needs_human_review"] == 1
+
+    day = store.query("classroom", date(2024, 3, 6), "day", school="north", grade="7", classroom="7b")
+    assert day.n == 1 and day.risk_counts["safe"] == 1
+
+def test_merge_matches_single_store():
+    single, w1, w2 = RollupStore(), RollupStore(), RollupStore()
+    entries = [("sad", "I feel lonely.", "7a"), ("happy", "Great day.", "7a"), ("tired", "so tired", "7b")]
+    for i, (emo, text, room) in enumerate(entries):
+        _add(single, emo, text, date(2024, 3, 4), room)
+        _add(w1 if i % 2 else w2, emo, text, date(2024, 3, 4), room)
+    w1.merge(w2)
+    merged = dict(w1.items())
+    for key, stats in single.items():
+        assert (merged[key].n, merged[key].risk_counts, merged[key].flag_counts) == \
+            (stats.n, stats.risk_counts, stats.flag_counts)
+        assert merged[key].mean_sentiment == pytest.approx(stats.mean_sentiment)
+
+def test_query_returns_copy_and_drop_before_expires_periods():
+    store = RollupStore()
+    _add(store, "sad", "I feel lonely.", date(2024, 3, 4), "7a")    # Monday
+    _add(store, "happy", "Great day.", date(2024, 3, 11), "7a")     # next Monday
+
+    got = store.query("school", date(2024, 3, 4), "week", school="north")
+    got.add(-1.0, "alert", ["x"])
+    assert store.query("school", date(2024, 3, 4), "week", school="north").n == 1
+
+    store.drop_before(date(2024, 3, 10))   # Sunday: week of 3/4 still current
+    assert store.query("school", date(2024, 3, 4), "day", school="north").n == 0
+    assert store.query("school", date(2024, 3, 4), "week", school="north").n == 1
+    assert store.drop_before(date(2024, 3, 11)) == 3   # three levels of that week
+    assert store.query("school", date(2024, 3, 4), "week", school="north").n == 0
+    assert store.query("school", date(2024, 3, 11), "day", school="north").n == 1
@@ -7,3 +7,53 @@ def test_analyze_returns_score_in_range():
 def test_concerning_phrase_flag():
     r = analyze_checkin("okay", "Sometimes I can't do this anymore.")
     assert "concerning_language" in r.flags
+
+def test_negation_scope_ends_at_punctuation():
+    from src.analyzer import ScorerConfig
+    joined = analyze_checkin("okay", "I am not sure, sad.")
+    split = analyze_checkin("okay", "I am not sure, sad.", config=ScorerConfig(reset_at_punctuation=False))
+    assert joined.sentiment_score < 0 < split.sentiment_score
+
+def test_configurable_negation_window_and_diminisher():
+    from src.analyzer import ScorerConfig
+    text = "I am not at all sad"
+    assert analyze_checkin("okay", text).sentiment_score < 0
+    assert analyze_checkin("okay", text, config=ScorerConfig(negation_window=3)).sentiment_score > 0
+    assert analyze_checkin("okay", "kinda sad").sentiment_score == -0.07
+
+def test_modifier_hits_count_modified_tokens():
+    f = analyze_checkin("okay", "really sad and kinda tired, so").features
+    assert (f["intensifier_hits"], f["diminisher_hits"]) == (1, 1)
+    assert analyze_checkin("okay", "so. sad").features["intensifier_hits"] == 0
+
+def test_segmented_single_sentence_matches_analyze_checkin():
+    from src.analyzer import analyze_segmented
+    entries = [("sad", "I feel really tired and alone."), ("okay", "Sometimes I can't do this anymore"), ("", "meh")]
+    for (emo, text), seg in zip(entries, analyze_segmented(entries)):
+        a = analyze_checkin(emo, text)
+        assert (seg.sentiment_score, seg.flags, seg.features) == (a.sentiment_score, a.flags, a.features)
+
+def test_segmented_aggregation_and_phrase_hits():
+    import pytest
+    from src.analyzer import analyze_segmented
+    entry = [("okay", "Today was great and fun! Then it got worse.\nI want to disappear")]
+    by_agg = {agg: analyze_segmented(entry, agg)[0] for agg in ("min", "mean", "last")}
+    scores = [s.sentiment_score for s in by_agg["min"].sentences]
+    assert len(scores) == 3
+    assert by_agg["min"].sentiment_score == min(scores)
+    assert by_agg["mean"].sentiment_score == pytest.approx(sum(scores) / 3)
+    assert by_agg["last"].sentiment_score == scores[-1]
+    assert [s.phrase_hits for s in by_agg["min"].sentences] == [[], [], ["i want to disappear"]]
+    assert by_agg["min"].flags == ["concerning_language"]
+    with pytest.raises(ValueError):
+        analyze_segmented(entry, "max")
+
+def test_segmented_phrases_do_not_match_across_punctuation():
+    from src.analyzer import analyze_segmented
+    from src.lexicon import current_lexicon
+    for text in ("I want to, disappear", "I want to disappear", "what's the point; really"):
+        seg = analyze_segmented([("okay", text)])[0]
+        assert seg.flags == analyze_checkin("okay", text).flags
+    lex = current_lexicon()
+    assert lex.phrase_index() is lex.phrase_index()
+    assert ("i", "want", "to", "disappear") in [w for w, _ in lex.phrase_index()["i"]]
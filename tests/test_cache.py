@@ -0,0 +1,63 @@
+from src.analyzer import analyze_checkin
+from src.cache import ResultCache
+from src.engine import assess_risk
+
+def test_repeat_checkin_is_a_hit_with_same_result():
+    cache = ResultCache(max_entries=8)
+    a1, r1 = cache.checkin("okay", "I'm fine")
+    a2, r2 = cache.checkin("OKAY", "  i'm FINE ")
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert a1 == a2 and r1 == r2
+    assert r1 == assess_risk(analyze_checkin("okay", "I'm fine"))
+
+def test_threshold_change_is_a_miss():
+    cache = ResultCache()
+    cache.checkin("sad", "I feel tired and alone.")
+    cache.checkin("sad", "I feel tired and alone.", watch_threshold=-0.2)
+    assert cache.stats.misses == 2
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    for text in ("one", "two", "three"):
+        cache.checkin("okay", text)
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+def test_disk_tier_shared_between_instances(tmp_path):
+    ResultCache(disk_dir=tmp_path).checkin("sad", "I feel lonely.")
+    other = ResultCache(disk_dir=tmp_path)
+    _, r = other.checkin("sad", "I feel lonely.")
+    assert other.stats.disk_hits == 1
+    assert r == assess_risk(analyze_checkin("sad", "I feel lonely."))
+
+def test_shared_between_threads():
+    import threading
+    cache = ResultCache(max_entries=2)
+    texts = [f"entry {i}" for i in range(6)]
+    errors = []
+
+    def work(t):
+        try:
+            for i in range(300):
+                cache.checkin("okay", texts[(t + i) % len(texts)])
+        except Exception as e:   # e.g. KeyError from a racing eviction
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert not errors
+    assert cache.stats.hits + cache.stats.misses == 8 * 300 and len(cache) <= 2
+
+def test_prune_removes_unused_disk_entries(tmp_path):
+    import os
+    cache = ResultCache(disk_dir=tmp_path)
+    cache.checkin("sad", "old entry")
+    cache.checkin("sad", "new entry")
+    files = list(tmp_path.glob("*/*.json"))
+    assert len(files) == 2
+    os.utime(files[0], (0, 0))
+    assert cache.prune() == 1
+    assert len(list(tmp_path.glob("*/*.json"))) == 1
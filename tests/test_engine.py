@@ -12,3 +12,16 @@ def test_watch_when_persistent_negative():
     a = analyze_checkin("sad", "I feel tired and alone.")
     r = assess_risk(a, recent_scores=recent)
     assert r.risk_level in ("watch", "alert")
+
+def test_decision_fast_path_matches_assess_risk():
+    from src.engine import RISK_LEVELS, decide_checkin, explain
+    recent = [-0.4, -0.3, 0.1, -0.5]
+    for emo, text in [
+        ("okay", "Sometimes I can't do this anymore."),
+        ("sad", "I feel really tired and alone."),
+        ("happy", "Today was great."),
+    ]:
+        full = assess_risk(analyze_checkin(emo, text), recent_scores=recent)
+        d = decide_checkin(emo, text, recent_scores=recent)
+        assert RISK_LEVELS[d.risk] == full.risk_level
+        assert explain(d) == full
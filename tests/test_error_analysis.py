@@ -0,0 +1,42 @@
+from src.error_analysis import ErrorIndex, row_features
+
+def _index():
+    idx = ErrorIndex()
+    rows = [
+        (10, "alert", "safe", "Sometimes I don't want to be here anymore."),
+        (11, "alert", "alert", "I can't do this anymore."),
+        (12, "safe", "safe", "Today was fine."),
+        (13, "watch", "safe", "Nothing matters to me lately"),
+    ]
+    for rid, yt, yp, text in rows:
+        idx.add(rid, yt, yp, row_features(text, "okay"))
+    return idx
+
+def test_query_filters_by_features_and_pair():
+    idx = _index()
+    assert idx.query(["tok:anymore"]) == [10, 11]
+    assert idx.query(["tok:anymore"], pair="alert->safe") == [10]
+    assert idx.query(pair="watch->safe") == [13]
+    assert idx.query(["tok:anymore", "tok:missing"]) == []
+
+def test_rank_attributes_tokens_to_error_pair():
+    idx = _index()
+    ranked = idx.rank("alert->safe", min_support=1)
+    assert ranked[0]["in_pair"] == 1 and ranked[0]["support"] == 1
+    assert idx.pair_counts("tok:anymore") == {"alert->safe": 1, "alert->alert": 1}
+
+def test_query_matches_brute_force():
+    import random
+    from src.engine import RISK_LEVELS
+    random.seed(0)
+    idx, rows = ErrorIndex(), []
+    for rid in range(500):
+        feats = {f"tok:w{random.randrange(20)}" for _ in range(5)}
+        pair = f"{random.choice(RISK_LEVELS)}->{random.choice(RISK_LEVELS)}"
+        idx.add(rid * 3, *pair.split("->"), feats)
+        rows.append((rid * 3, pair, feats))
+    for _ in range(50):
+        want = {f"tok:w{random.randrange(20)}" for _ in range(random.randint(1, 3))}
+        pair = random.choice([None, "alert->safe", "safe->safe"])
+        expected = [rid for rid, p, f in rows if want <= f and pair in (None, p)]
+        assert idx.query(want, pair=pair) == expected
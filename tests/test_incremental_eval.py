@@ -0,0 +1,42 @@
+from src.incremental_eval import build_report, update
+from src.run_experiments import load_corpus, run_experiment
+
+HEADER = "text,emotion_hint,risk_label,reason_tag\n"
+ROWS = [
+    '"I feel lonely even when people are around.",sad,watch,loneliness\n',
+    '"Today was normal, just a regular day.",,safe,\n',
+    '"I think about hurting myself when things get bad.",,alert,self_harm_hint\n',
+]
+
+def test_appended_rows_match_full_recompute(tmp_path):
+    p = tmp_path / "corpus.csv"
+    p.write_text(HEADER + ROWS[0], encoding="utf-8")
+    ckpt, scored, full = update(p, None)
+    assert (scored, full) == (1, True)
+
+    p.write_text(HEADER + "".join(ROWS), encoding="utf-8")
+    ckpt, scored, full = update(p, ckpt)
+    assert (scored, full) == (2, False)
+
+    rows = load_corpus(p)
+    assert build_report(ckpt)["metrics"][2] == run_experiment("C_hybrid", rows)
+
+def test_edited_prefix_forces_full_recompute(tmp_path):
+    p = tmp_path / "corpus.csv"
+    p.write_text(HEADER + ROWS[0], encoding="utf-8")
+    ckpt, _, _ = update(p, None)
+    p.write_text(HEADER + ROWS[1] + ROWS[2], encoding="utf-8")
+    ckpt, scored, full = update(p, ckpt)
+    assert (scored, full) == (2, True)
+
+def test_partial_row_with_quoted_newline_waits(tmp_path):
+    p = tmp_path / "corpus.csv"
+    partial = '"I feel tired.\nAnd'
+    p.write_text(HEADER + ROWS[0] + partial, encoding="utf-8")
+    ckpt, scored, _ = update(p, None)
+    assert scored == 1
+
+    p.write_text(HEADER + ROWS[0] + partial + ' alone.",sad,watch,loneliness\n', encoding="utf-8")
+    ckpt, scored, full = update(p, ckpt)
+    assert (scored, full) == (1, False)
+    assert build_report(ckpt)["metrics"][2] == run_experiment("C_hybrid", load_corpus(p))
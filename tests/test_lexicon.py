@@ -0,0 +1,81 @@
+import shutil
+from pathlib import Path
+
+from src.analyzer import analyze_checkin
+from src.lexicon import LEXICON_PATH, LexiconStore, load_lexicon
+
+def _copy(tmp_path) -> Path:
+    p = tmp_path / "lexicon.toml"
+    shutil.copy(LEXICON_PATH, p)
+    return p
+
+def test_snapshot_written_and_reused(tmp_path):
+    p = _copy(tmp_path)
+    lex = load_lexicon(p)
+    assert (tmp_path / "lexicon.toml.snapshot").exists()
+    assert load_lexicon(p) == lex and load_lexicon(p).version() == lex.version()
+
+def test_store_swaps_on_change_and_keeps_old_on_bad_file(tmp_path):
+    p = _copy(tmp_path)
+    store = LexiconStore(p, check_interval=0.0)
+    old = store.current()
+    assert "drained" not in old.neg_words
+
+    p.write_text(p.read_text(encoding="utf-8").replace('"broken",', '"broken", "drained",'), encoding="utf-8")
+    new = store.current()
+    assert "drained" in new.neg_words and new.version() != old.version()
+    assert analyze_checkin("okay", "so drained", lexicon=new).lexicon_version == new.version()
+
+    p.write_text("schema = 1\n[words\n", encoding="utf-8")
+    assert store.current() is new
+    assert store.last_error is not None
+
+def test_snapshot_is_json_and_bad_snapshot_is_recompiled(tmp_path):
+    import json
+    p = _copy(tmp_path)
+    lex = load_lexicon(p)
+    snap = tmp_path / "lexicon.toml.snapshot"
+    assert json.loads(snap.read_text(encoding="utf-8"))["lexicon"]["schema"] == 1
+
+    snap.write_bytes(b"\x80\x04not json")
+    assert load_lexicon(p) == lex
+    assert json.loads(snap.read_text(encoding="utf-8"))["source_sha256"]
+
+def test_lexicon_is_immutable_and_hashable():
+    import pytest
+    lex = load_lexicon(LEXICON_PATH)
+    with pytest.raises(TypeError):
+        lex.emotion_base["sad"] = 0.9
+    changed = lex.adjusted(emotion_base={"sad": 0.9})
+    with pytest.raises(TypeError):
+        changed.emotion_base["sad"] = -0.9
+    assert changed.version() != lex.version() and changed != lex
+    assert len({lex, load_lexicon(LEXICON_PATH), changed}) == 2
+
+def test_lexicon_pickles_and_deep_copies():
+    import copy
+    import pickle
+    from src.shadow import config_from_dict
+    lex = load_lexicon(LEXICON_PATH).adjusted(add={"neg_words": ["Drained"]})
+    for clone in (pickle.loads(pickle.dumps(lex)), copy.deepcopy(lex)):
+        assert clone == lex and clone.version() == lex.version()
+        assert clone.phrase_index() == lex.phrase_index()
+    cfg = config_from_dict({"name": "x"})
+    assert pickle.loads(pickle.dumps(cfg)) == cfg
+
+def test_store_keeps_old_snapshot_on_wrongly_typed_file(tmp_path):
+    import pytest
+    p = _copy(tmp_path)
+    store = LexiconStore(p, check_interval=0.0)
+    old = store.current()
+    source = p.read_text(encoding="utf-8")
+    for bad in (
+        source.replace("sad = -0.6", 'sad = "very"'),
+        source.replace("pos_words = [", "pos_words = [1, "),
+        source.replace("pos_words = [", 'pos_words = "happy"\nunused = ['),
+    ):
+        p.write_text(bad, encoding="utf-8")
+        assert store.current() is old
+        assert isinstance(store.last_error, ValueError)
+    with pytest.raises(ValueError):
+        load_lexicon(p)
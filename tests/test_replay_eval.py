@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analyzer import analyze_checkin
+from src.engine import assess_risk
+from src.replay_eval import persistence_flags
+
+def test_persistence_matches_per_student_history_lists():
+    rng = random.Random(0)
+    texts = [("sad", "I feel tired and alone."), ("happy", "Great day"), ("anxious", "so worried"), ("okay", "fine")]
+    entries = [(f"s{rng.randrange(5)}", float(rng.randrange(1000)), *rng.choice(texts)) for _ in range(200)]
+    entries = list({(sid, ts): (sid, ts, e, t) for sid, ts, e, t in entries}.values())  # unique times per student
+
+    scores = np.array([analyze_checkin(e, t).sentiment_score for _, _, e, t in entries])
+    got = persistence_flags([sid for sid, *_ in entries], np.array([ts for _, ts, *_ in entries]), scores)
+
+    history = {}
+    expected = {}
+    for i in sorted(range(len(entries)), key=lambda i: (entries[i][0], entries[i][1])):
+        sid, _, e, t = entries[i]
+        a = analyze_checkin(e, t)
+        r = assess_risk(a, recent_scores=history.get(sid, []))
+        expected[i] = "persistent_negative_pattern" in r.flags
+        history.setdefault(sid, []).append(a.sentiment_score)
+
+    assert got.tolist() == [expected[i] for i in range(len(entries))]
+    assert any(expected.values())
+
+def test_blank_student_ids_have_no_history():
+    scores = np.full(6, -0.9)
+    got = persistence_flags(["", "", "", "", "", "s1"], np.arange(6, dtype=float), scores)
+    assert not got.any()
+    got = persistence_flags(["", "s1", "s1", "", "s1", "s1", "s1"], np.arange(7, dtype=float), np.full(7, -0.9))
+    assert got.tolist() == [False, False, False, False, False, False, True]
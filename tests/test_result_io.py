@@ -0,0 +1,99 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.analyzer import analyze_checkin
+from src.engine import assess_risk
+from src.result_io import (
+    RECORD_SIZE,
+    BinaryResultWriter,
+    JsonlWriter,
+    explain_record,
+    read_results,
+    record_dtype,
+    result_record,
+)
+
+ENTRIES = [
+    ("sad", "I feel tired and alone. I want to disappear."),
+    ("happy", "Great day with my friends!"),
+    ("anxious", "I am so worried about exams"),
+    ("", "meh"),
+]
+
+
+def _results():
+    out = []
+    for emo, text in ENTRIES:
+        a = analyze_checkin(emo, text)
+        out.append((a, assess_risk(a, recent_scores=[])))
+    return out
+
+
+def test_jsonl_lines_match_result_record():
+    buf = io.StringIO()
+    w = JsonlWriter(buf)
+    for i, (a, alert) in enumerate(_results()):
+        w.write(a, alert, row_id=i)
+
+    lines = buf.getvalue().splitlines()
+    assert len(lines) == len(ENTRIES)
+    for i, (line, (a, alert)) in enumerate(zip(lines, _results())):
+        record = {"id": i, **result_record(a, alert)}
+        assert line == json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_binary_round_trip(tmp_path):
+    path = tmp_path / "results.bin"
+    results = _results()
+    with path.open("wb") as f, BinaryResultWriter(f, ["sad", "happy", "anxious"], buffer_records=3) as w:
+        for i, (a, alert) in enumerate(results):
+            w.write(100 + i, a, alert)
+
+    for mmap in (True, False):
+        meta, recs = read_results(path, mmap=mmap)
+        assert meta["emotions"] == ["sad", "happy", "anxious"]
+        assert meta["lexicon_version"] == results[0][0].lexicon_version != ""
+        assert list(recs["id"]) == [100, 101, 102, 103]
+        assert recs["emotion"][3] == 255
+        for rec, (a, alert) in zip(recs, results):
+            assert rec["sentiment"] == pytest.approx(a.sentiment_score, abs=1e-6)
+            assert meta["risk_levels"][rec["risk"]] == alert.risk_level
+            assert list(rec["features"]) == [a.features[k] for k in meta["features"]]
+            back = explain_record(rec)
+            assert sorted(back.flags) == sorted(alert.flags)
+            assert back.suggested_action == alert.suggested_action
+
+
+def test_binary_writer_rejects_other_lexicon_version(tmp_path):
+    from src.engine import Decision
+    from src.lexicon import current_lexicon
+
+    other = current_lexicon().adjusted(add={"neg_words": ["drained"]})
+    a = analyze_checkin("sad", "so drained")
+    b = analyze_checkin("sad", "so drained", lexicon=other)
+    path = tmp_path / "results.bin"
+    with path.open("wb") as f, BinaryResultWriter(f, ["sad"]) as w:
+        w.write(1, a, assess_risk(a))
+        with pytest.raises(ValueError):
+            w.write(2, b, assess_risk(b))
+        with pytest.raises(ValueError):
+            w.write_decision(3, "sad", 0.0, Decision(0, 0))
+    meta, recs = read_results(path)
+    assert meta["lexicon_version"] == a.lexicon_version
+    assert list(recs["id"]) == [1]
+
+def test_cli_and_writers_import_without_numpy():
+    code = (
+        "import sys; sys.modules['numpy'] = None\n"
+        "import app.cli, io\n"
+        "from src.result_io import BinaryResultWriter\n"
+        "BinaryResultWriter(io.BytesIO(), ['sad']).close()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert record_dtype().itemsize == RECORD_SIZE
@@ -0,0 +1,70 @@
+import threading
+
+from src.analyzer import analyze_checkin
+from src.engine import RISK_LEVELS, assess_risk, decide_checkin
+from src.lexicon import DEFAULT_LEXICON
+from src.scorer import Scorer
+
+ENTRIES = [
+    ("sad", "I feel tired and alone. I want to disappear."),
+    ("happy", "Great day with my friends!"),
+    ("anxious", "I am so worried about exams"),
+    ("okay", "not bad, not great"),
+    ("", "meh"),
+]
+
+
+def test_scorer_matches_module_functions():
+    scorer = Scorer(cache_size=8)
+    for emo, text in ENTRIES:
+        assert scorer.decide(emo, text) == decide_checkin(emo, text)
+        assert scorer.decide(emo, text) == decide_checkin(emo, text)  # cached
+        analysis, alert = scorer.checkin(emo, text, recent_scores=[-0.5, -0.5, -0.5, -0.5])
+        assert analysis == analyze_checkin(emo, text)
+        assert alert == assess_risk(analysis, recent_scores=[-0.5, -0.5, -0.5, -0.5])
+
+
+def test_with_lexicon_keeps_history():
+    scorer = Scorer(history=True)
+    scorer.decide("sad", "I feel tired", student_id="s1")
+    swapped = scorer.with_lexicon(DEFAULT_LEXICON.adjusted(add={"neg_words": ["meh"]}))
+    assert swapped.lexicon_version != scorer.lexicon_version
+    assert swapped.history("s1") == scorer.history("s1") and len(swapped.history("s1")) == 1
+
+
+def test_concurrent_calls_match_serial_results():
+    threads, per_thread = 8, 400
+    expected = {e: decide_checkin(*e) for e in ENTRIES}
+    scorer = Scorer(cache_size=3, history=True)  # tiny cache: constant evictions
+    errors = []
+    start = threading.Barrier(threads)
+
+    def work(t: int) -> None:
+        start.wait()
+        for i in range(per_thread):
+            emo, text = ENTRIES[(t + i) % len(ENTRIES)]
+            d = scorer.decide(emo, text)
+            if d != expected[(emo, text)]:
+                errors.append((emo, text, d))
+            scorer.decide(emo, text, student_id=f"s{t}")
+
+    workers = [threading.Thread(target=work, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert not errors
+    assert scorer.cache_len() <= 3
+    for t in range(threads):
+        # Each thread owns one student: its history is exactly its own last scores.
+        tail = [ENTRIES[(t + i) % len(ENTRIES)] for i in range(per_thread - 4, per_thread)]
+        assert scorer.history(f"s{t}") == [Scorer().score(e, x)[0] for e, x in tail]
+    assert RISK_LEVELS[scorer.decide("sad", "I want to disappear").risk] == "alert"
+
+def test_cache_size_is_a_total_limit():
+    for size in (1, 5, 40):
+        scorer = Scorer(cache_size=size)
+        for i in range(1000):
+            scorer.decide("okay", f"entry number {i}")
+        assert scorer.cache_len() == size
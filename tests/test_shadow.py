@@ -0,0 +1,47 @@
+from src.engine import RISK_LEVELS, decide_checkin
+from src.shadow import ShadowScorer, config_from_dict
+
+def test_shadow_scorer_serves_primary_and_tallies_candidates():
+    primary = config_from_dict({"name": "baseline"})
+    lenient = config_from_dict({"name": "lenient", "watch_threshold": -0.95})
+    no_phrases = config_from_dict({
+        "name": "no_phrase",
+        "lexicon": {"remove": {"concerning_phrases": ["i can't do this anymore"]}},
+    })
+    shadow = ShadowScorer(primary, [lenient, no_phrases])
+
+    for emo, text in [("anxious", "I am tired."), ("okay", "I can't do this anymore.")]:
+        assert shadow.decide(emo, text) == decide_checkin(emo, text)
+
+    assert shadow.disagreements["lenient"] == {"watch->safe": 1}
+    assert shadow.disagreements["no_phrase"] == {"alert->safe": 1}
+
+def test_disabled_rule_changes_decision():
+    cfg = config_from_dict({"name": "no_A", "disabled_rules": ["A"]})
+    shadow = ShadowScorer(config_from_dict({"name": "base"}), [cfg])
+    d = shadow.decide("okay", "I want to disappear")
+    assert RISK_LEVELS[d.risk] == "alert"
+    assert shadow.disagreements["no_A"] == {"alert->safe": 1}
+
+def test_recent_scores_reach_rule_d_for_every_config():
+    shadow = ShadowScorer(
+        config_from_dict({"name": "base"}),
+        [config_from_dict({"name": "no_D", "disabled_rules": ["D"]})],
+    )
+    recent = [-0.3, -0.4, -0.5, -0.3]
+    d = shadow.decide("okay", "meh", recent_scores=recent)
+    assert d == decide_checkin("okay", "meh", recent_scores=recent)
+    assert RISK_LEVELS[d.risk] == "watch"
+    assert shadow.disagreements["no_D"] == {"watch->safe": 1}
+
+def test_tallies_are_exact_under_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    shadow = ShadowScorer(
+        config_from_dict({"name": "base"}),
+        [config_from_dict({"name": "lenient", "watch_threshold": -0.95})],
+    )
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: shadow.decide("anxious", "I am tired."), range(2000)))
+    assert shadow.n == 2000
+    assert shadow.disagreements["lenient"] == {"watch->safe": 2000}
@@ -0,0 +1,46 @@
+import pytest
+
+from src.analyzer import analyze_checkin
+from src.sketches import CountMinSketch, HeavyHitters, HyperLogLog, TrendSketch
+
+def test_count_min_never_undercounts_and_merges():
+    a, b = CountMinSketch(width=64, depth=4), CountMinSketch(width=64, depth=4)
+    for i in range(500):
+        (a if i % 2 else b).add(f"w{i % 50}")
+    a.merge(b)
+    assert all(a.estimate(f"w{i}") >= 10 for i in range(50))
+    assert a.total == 500
+
+def test_heavy_hitters_keeps_frequent_items():
+    hh = HeavyHitters(capacity=5)
+    for i in range(1000):
+        hh.add("lonely" if i % 3 == 0 else f"noise{i}")
+    assert hh.top(1)[0][0] == "lonely"
+
+def test_hyperloglog_estimate_and_merge():
+    a, b = HyperLogLog(p=12), HyperLogLog(p=12)
+    for i in range(3000):
+        a.add(f"s{i}")
+        b.add(f"s{i + 1500}")
+    a.merge(b)
+    assert a.count() == pytest.approx(4500, rel=0.05)
+
+def test_trend_sketch_from_analyzer_output():
+    day1, day2 = TrendSketch(), TrendSketch()
+    text = "I feel so lonely. I can't do this anymore"
+    for sid, sketch in (("s1", day1), ("s2", day2), ("s1", day2)):
+        sketch.observe_analysis(sid, text, analyze_checkin("sad", text), timestamp=1.0)
+    day1.merge(day2)
+    assert day1.word_count("lonely") >= 3
+    assert round(day1.distinct_students("concerning_language")) == 2
+    assert day1.ewma("s1") is not None
+
+@pytest.mark.parametrize("kwargs", [{"width": 1024}, {"heavy_hitters": 32}, {"hll_p": 10}, {"ewma_alpha": 0.5}])
+def test_trend_sketch_merge_rejects_other_settings_untouched(kwargs):
+    a, b = TrendSketch(), TrendSketch(**kwargs)
+    a.observe("s1", ["sad"], ["concerning_language"], -0.5)
+    b.observe("s2", ["sad"], ["concerning_language", "watch_threshold_triggered"], -0.5)
+    with pytest.raises(ValueError):
+        a.merge(b)
+    assert (a.n, a.word_count("sad"), a.flag_counts) == (1, 1, {"concerning_language": 1})
+    assert set(a.flag_students) == {"concerning_language"}
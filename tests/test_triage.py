@@ -0,0 +1,53 @@
+import random
+
+from src.analyzer import analyze_checkin
+from src.engine import assess_risk
+from src.triage import TriageQueue
+
+def _push(q, sid, emo, text, ts):
+    a = analyze_checkin(emo, text)
+    return q.push(sid, assess_risk(a), a.sentiment_score, ts)
+
+def test_alert_ranks_first_and_recheckin_reprioritizes():
+    q = TriageQueue()
+    _push(q, "s1", "sad", "I feel really tired and alone.", 1.0)
+    _push(q, "s2", "happy", "Great day.", 2.0)
+    _push(q, "s3", "okay", "Sometimes I can't do this anymore.", 3.0)
+    assert [i.student_id for i in q.top(2)] == ["s3", "s1"]
+
+    _push(q, "s2", "okay", "I want to disappear", 4.0)
+    assert q.get("s2").waiting_since == 2.0
+    assert q.peek().student_id == "s2"
+
+    assert q.acknowledge("s2").student_id == "s2"
+    assert "s2" not in q and len(q) == 2
+    assert q.pop().student_id == "s3"
+
+def test_heap_order_under_random_updates():
+    rng = random.Random(0)
+    texts = [("sad", "so lonely and sad"), ("happy", "fine"), ("okay", "hurt myself"), ("tired", "tired")]
+    q = TriageQueue()
+    for t in range(300):
+        sid = f"s{rng.randrange(40)}"
+        if rng.random() < 0.2:
+            q.acknowledge(sid)
+        else:
+            _push(q, sid, *rng.choice(texts), float(t))
+    expected = sorted((q.get(s).severity_key() for s in list(q._pos)))
+    assert [i.severity_key() for i in q.top(len(q))] == expected
+    assert [q.pop().severity_key() for _ in range(len(q))] == expected
+
+def test_benign_recheckin_keeps_pending_alert():
+    q = TriageQueue()
+    _push(q, "s1", "okay", "I want to disappear", 1.0)
+    _push(q, "s2", "sad", "I feel really tired and alone.", 2.0)
+    _push(q, "s1", "happy", "fine", 3.0)
+
+    item = q.get("s1")
+    assert item.risk_level == "alert" and "needs_human_review" in item.flags
+    assert (item.waiting_since, item.updated_at) == (1.0, 3.0)
+    assert [i.student_id for i in q.top(2)] == ["s1", "s2"]
+
+    q.acknowledge("s1")
+    _push(q, "s1", "happy", "fine", 4.0)
+    assert q.get("s1").risk_level == "safe"